@@ -0,0 +1,107 @@
+from collections import namedtuple
+
+import numpy as np
+
+from calculator import calculate_compound_interest, calculate_compound_interest_batch
+
+
+AmortizationRow = namedtuple("AmortizationRow", ["period", "payment", "interest", "principal", "balance"])
+
+PERIODS_ERROR = "n * time должно быть целым положительным числом периодов"
+
+
+def count_periods(time, n):
+    periods = round(n * time)
+    if periods <= 0 or abs(n * time - periods) > 1e-9:
+        raise ValueError(PERIODS_ERROR)
+    return periods
+
+
+def count_periods_batch(time, n):
+    raw = np.asarray(n) * np.asarray(time, dtype=np.float64)
+    periods = np.rint(raw).astype(np.int64)
+    if np.any(periods <= 0) or np.any(np.abs(raw - periods) > 1e-9):
+        raise ValueError(PERIODS_ERROR)
+    return periods
+
+
+def calculate_annuity_payment(principal, rate, time, n=1):
+    if principal < 0:
+        raise ValueError("Аргументы должны быть неотрицательными")
+
+    growth = calculate_compound_interest(1, rate, time, n)
+    periods = count_periods(time, n)
+    if growth == 0:
+        return principal / periods
+
+    return principal * rate / (100 * n) * (growth + 1) / growth
+
+
+def calculate_annuity_payment_batch(principal, rate, time, n=1):
+    principal = np.asarray(principal, dtype=np.float64)
+    if np.any(principal < 0):
+        raise ValueError("Аргументы должны быть неотрицательными")
+
+    growth = calculate_compound_interest_batch(1, rate, time, n)
+    periods = count_periods_batch(time, n)
+    rate = np.asarray(rate, dtype=np.float64)
+    flat = growth == 0
+    safe_growth = np.where(flat, 1.0, growth)
+    payment = principal * rate / (100 * np.asarray(n)) * (growth + 1) / safe_growth
+
+    return np.where(flat, principal / periods, payment)
+
+
+def amortization_schedule(principal, rate, time, n=1):
+    payment = calculate_annuity_payment(principal, rate, time, n)
+    periods = count_periods(time, n)
+    period_rate = rate / (100 * n)
+    balance = principal
+
+    for period in range(1, periods + 1):
+        interest = balance * period_rate
+        if period == periods:
+            yield AmortizationRow(period, interest + balance, interest, balance, 0.0)
+            return
+
+        principal_part = payment - interest
+        balance -= principal_part
+        yield AmortizationRow(period, payment, interest, principal_part, balance)
+
+
+def amortization_schedule_batch(principal, rate, time, n=1):
+    payment = calculate_annuity_payment_batch(principal, rate, time, n)
+    periods = count_periods_batch(time, n)
+    period_rate = np.asarray(rate, dtype=np.float64) / (100 * np.asarray(n))
+    payment, periods, period_rate, balance = np.broadcast_arrays(
+        payment, periods, period_rate, np.asarray(principal, dtype=np.float64)
+    )
+    balance = balance.copy()
+
+    for period in range(1, int(periods.max(initial=0)) + 1):
+        interest = balance * period_rate
+        last = periods == period
+        principal_part = np.where(last, balance, payment - interest)
+        current_payment = np.where(last, interest + balance, payment)
+        inactive = periods < period
+        interest[inactive] = 0.0
+        principal_part[inactive] = 0.0
+        current_payment[inactive] = 0.0
+        balance = balance - principal_part
+        balance[last] = 0.0
+        yield AmortizationRow(period, current_payment, interest, principal_part, balance)
+
+
+def amortization_table_batch(principal, rate, time, n=1):
+    rows = list(amortization_schedule_batch(principal, rate, time, n))
+    if not rows:
+        empty = np.empty((0, 0))
+        return AmortizationRow(np.empty(0, dtype=np.int64), empty, empty, empty, empty)
+
+    return AmortizationRow(
+        np.arange(1, len(rows) + 1),
+        np.column_stack([row.payment for row in rows]),
+        np.column_stack([row.interest for row in rows]),
+        np.column_stack([row.principal for row in rows]),
+        np.column_stack([row.balance for row in rows]),
+    )
@@ -1,3 +1,9 @@
+from decimal import Decimal, localcontext
+from functools import lru_cache
+
+import numpy as np
+
+
 def calculate_simple_interest(principal, rate, time):
     if principal < 0 or rate < 0 or time < 0:
         raise ValueError("Аргументы должны быть неотрицательными")
@@ -20,4 +26,103 @@ def calculate_tax(amount, tax_rate):
     if tax_rate < 0 or tax_rate > 100:
         raise ValueError("Налоговая ставка должна быть между 0 и 100")
     
-    return amount * tax_rate / 100
\ No newline at end of file
+    return amount * tax_rate / 100
+
+
+def as_float_array(values):
+    return np.asarray(values, dtype=np.float64)
+
+
+def check_n_batch(n):
+    n = np.asarray(n)
+    if n.dtype.kind not in "iu" or np.any(n <= 0):
+        raise ValueError("n должно быть целым положительным числом")
+    return n
+
+
+def calculate_simple_interest_batch(principal, rate, time):
+    principal = as_float_array(principal)
+    rate = as_float_array(rate)
+    time = as_float_array(time)
+    if np.any((principal < 0) | (rate < 0) | (time < 0)):
+        raise ValueError("Аргументы должны быть неотрицательными")
+
+    return principal * rate * time / 100
+
+
+def calculate_compound_interest_batch(principal, rate, time, n=1):
+    principal = as_float_array(principal)
+    rate = as_float_array(rate)
+    time = as_float_array(time)
+    if np.any((principal < 0) | (rate < 0) | (time < 0)):
+        raise ValueError("Аргументы должны быть неотрицательными")
+
+    n = check_n_batch(n)
+
+    amount = principal * (1 + rate / (100 * n)) ** (n * time)
+    return amount - principal
+
+
+def calculate_tax_batch(amount, tax_rate):
+    amount = as_float_array(amount)
+    tax_rate = as_float_array(tax_rate)
+    if np.any((tax_rate < 0) | (tax_rate > 100)):
+        raise ValueError("Налоговая ставка должна быть между 0 и 100")
+
+    return amount * tax_rate / 100
+
+
+DECIMAL_PRECISION = 50
+GROWTH_FACTOR_CACHE_SIZE = 1024
+
+
+def _to_decimal(value):
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def _power_by_squaring(base, exponent):
+    result = Decimal(1)
+    while exponent:
+        if exponent & 1:
+            result *= base
+        base *= base
+        exponent >>= 1
+    return result
+
+
+def _growth_factor(rate, n, periods):
+    with localcontext() as context:
+        context.prec = DECIMAL_PRECISION
+        return _power_by_squaring(1 + rate / (100 * n), periods)
+
+
+_cached_growth_factor = lru_cache(maxsize=GROWTH_FACTOR_CACHE_SIZE)(_growth_factor)
+
+
+def set_growth_factor_cache_size(maxsize):
+    global _cached_growth_factor
+    _cached_growth_factor = lru_cache(maxsize=maxsize)(_growth_factor)
+
+
+def growth_factor_cache_info():
+    return _cached_growth_factor.cache_info()
+
+
+def calculate_compound_interest_exact(principal, rate, time, n=1):
+    principal = _to_decimal(principal)
+    rate = _to_decimal(rate)
+    time = _to_decimal(time)
+    if principal < 0 or rate < 0 or time < 0:
+        raise ValueError("Аргументы должны быть неотрицательными")
+
+    if not isinstance(n, int) or n <= 0:
+        raise ValueError("n должно быть целым положительным числом")
+
+    periods = n * time
+    if periods != periods.to_integral_value():
+        raise ValueError("n * time должно быть целым числом для точного расчета")
+
+    growth = _cached_growth_factor(rate, n, int(periods))
+    with localcontext() as context:
+        context.prec = DECIMAL_PRECISION
+        return principal * growth - principal
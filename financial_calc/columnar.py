@@ -0,0 +1,197 @@
+import argparse
+import os
+import struct
+import sys
+
+import numpy as np
+
+from calculator import (
+    calculate_simple_interest_batch,
+    calculate_compound_interest_batch,
+    calculate_tax_batch
+)
+from positions import INPUT_COLUMNS, read_chunks, parse_chunk
+
+
+MAGIC = b"FCOL"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQ")
+NAME_SIZE = 24
+COLUMN = struct.Struct(f"<{NAME_SIZE}sc7x")
+ALIGNMENT = 64
+
+DTYPES = {b"d": np.dtype("<f8"), b"i": np.dtype("<i4")}
+DTYPE_CODES = {dtype: code for code, dtype in DTYPES.items()}
+
+LOAN_BOOK_SCHEMA = {
+    "principal": DTYPES[b"d"],
+    "rate": DTYPES[b"d"],
+    "time": DTYPES[b"d"],
+    "n": DTYPES[b"i"],
+    "tax_rate": DTYPES[b"d"],
+}
+RESULT_SCHEMA = {
+    "simple_interest": DTYPES[b"d"],
+    "compound_interest": DTYPES[b"d"],
+    "tax": DTYPES[b"d"],
+    "after_tax_interest": DTYPES[b"d"],
+}
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _layout(schema, rows):
+    offset = _align(HEADER.size + COLUMN.size * len(schema))
+    layout = {}
+    for name, dtype in schema.items():
+        layout[name] = (dtype, offset)
+        offset = _align(offset + dtype.itemsize * rows)
+    return layout, offset
+
+
+def _views(path, mode, layout, rows, size):
+    if rows == 0:
+        return {name: np.empty(0, dtype=dtype) for name, (dtype, _) in layout.items()}
+
+    buffer = np.memmap(path, dtype=np.uint8, mode=mode, shape=(size,))
+    return {
+        name: np.ndarray(rows, dtype=dtype, buffer=buffer, offset=offset)
+        for name, (dtype, offset) in layout.items()
+    }
+
+
+def create_columnar(path, schema, rows):
+    for name, dtype in schema.items():
+        if len(name.encode("ascii")) > NAME_SIZE or np.dtype(dtype) not in DTYPE_CODES:
+            raise ValueError(f"Недопустимая колонка: {name}")
+
+    schema = {name: np.dtype(dtype) for name, dtype in schema.items()}
+    layout, size = _layout(schema, rows)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(schema), rows))
+        for name, dtype in schema.items():
+            file.write(COLUMN.pack(name.encode("ascii"), DTYPE_CODES[dtype]))
+        file.truncate(size)
+
+    return _views(path, "r+", layout, rows, size)
+
+
+def flush_columnar(columns):
+    for values in columns.values():
+        if isinstance(values.base, np.memmap):
+            values.base.flush()
+            return
+
+
+def write_columnar(path, columns):
+    columns = {name: np.asarray(values) for name, values in columns.items()}
+    rows = len(next(iter(columns.values()), []))
+    if any(len(values) != rows for values in columns.values()):
+        raise ValueError("Колонки должны быть одинаковой длины")
+
+    views = create_columnar(path, {name: values.dtype for name, values in columns.items()}, rows)
+    for name, values in columns.items():
+        views[name][:] = values
+    flush_columnar(views)
+
+
+def open_columnar(path):
+    with open(path, "rb") as file:
+        magic, version, count, rows = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Файл {path} не является колоночным файлом версии {VERSION}")
+        schema = {}
+        for _ in range(count):
+            name, code = COLUMN.unpack(file.read(COLUMN.size))
+            if code not in DTYPES:
+                raise ValueError(f"Файл {path} поврежден: неизвестный тип колонки {code!r}")
+            schema[name.rstrip(b"\0").decode("ascii")] = DTYPES[code]
+
+    layout, size = _layout(schema, rows)
+    if os.path.getsize(path) < size:
+        raise ValueError(f"Файл {path} поврежден: ожидалось {size} байт")
+
+    return _views(path, "r", layout, rows, size)
+
+
+def _check_range(name, values, dtype):
+    if dtype.kind == "i" and values.size:
+        info = np.iinfo(dtype)
+        if values.min() < info.min or values.max() > info.max:
+            raise ValueError(f"Значения колонки {name} не помещаются в {dtype.name}")
+
+
+def convert_csv(csv_path, path, chunk_size=100000):
+    with open(csv_path, newline="", encoding="utf-8") as source:
+        rows = sum(len(chunk) for _, chunk in read_chunks(source, "csv", chunk_size))
+
+    columns = create_columnar(path, LOAN_BOOK_SCHEMA, rows)
+    start = 0
+    with open(csv_path, newline="", encoding="utf-8") as source:
+        for header, chunk in read_chunks(source, "csv", chunk_size):
+            _, arrays = parse_chunk(header, chunk, "csv")
+            stop = start + len(arrays[0])
+            for name, values in zip(INPUT_COLUMNS, arrays):
+                _check_range(name, values, LOAN_BOOK_SCHEMA[name])
+                columns[name][start:stop] = values
+            start = stop
+
+    flush_columnar(columns)
+    return rows
+
+
+def evaluate_columnar(source_path, target_path, chunk_size=1000000):
+    book = open_columnar(source_path)
+    rows = len(book["principal"])
+    results = create_columnar(target_path, RESULT_SCHEMA, rows)
+
+    for start in range(0, rows, chunk_size):
+        part = slice(start, start + chunk_size)
+        compound = calculate_compound_interest_batch(
+            book["principal"][part], book["rate"][part], book["time"][part], book["n"][part]
+        )
+        tax = calculate_tax_batch(compound, book["tax_rate"][part])
+        results["simple_interest"][part] = calculate_simple_interest_batch(
+            book["principal"][part], book["rate"][part], book["time"][part]
+        )
+        results["compound_interest"][part] = compound
+        results["tax"][part] = tax
+        results["after_tax_interest"][part] = compound - tax
+
+    flush_columnar(results)
+    return rows
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Колоночный бинарный формат кредитного портфеля")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    convert = commands.add_parser("convert", help="преобразовать CSV в колоночный файл")
+    convert.add_argument("input")
+    convert.add_argument("output")
+    convert.add_argument("-c", "--chunk-size", type=int, default=100000)
+
+    evaluate = commands.add_parser("evaluate", help="рассчитать проценты и налоги по колоночному файлу")
+    evaluate.add_argument("input")
+    evaluate.add_argument("output")
+    evaluate.add_argument("-c", "--chunk-size", type=int, default=1000000)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    command = convert_csv if args.command == "convert" else evaluate_columnar
+    try:
+        rows = command(args.input, args.output, args.chunk_size)
+    except ValueError as error:
+        print(f"Ошибка: {error}", file=sys.stderr)
+        return 1
+
+    print(f"Обработано строк: {rows}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+import argparse
+import csv
+import io
+import json
+import os
+import resource
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from calculator import (
+    calculate_simple_interest_batch,
+    calculate_compound_interest_batch,
+    calculate_tax_batch
+)
+from positions import INPUT_COLUMNS, read_chunks, parse_chunk
+
+
+OUTPUT_COLUMNS = INPUT_COLUMNS + ["simple_interest", "compound_interest", "tax", "after_tax_interest"]
+
+
+def detect_format(path):
+    return "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def evaluate_chunk(header, chunk, input_format, output_format):
+    columns, (principal, rate, time_, n, tax_rate) = parse_chunk(header, chunk, input_format)
+    simple = calculate_simple_interest_batch(principal, rate, time_)
+    compound = calculate_compound_interest_batch(principal, rate, time_, n)
+    tax = calculate_tax_batch(compound, tax_rate)
+    results = [simple, compound, tax, compound - tax]
+
+    if output_format == "csv":
+        fields = [list(map(str, columns[name])) for name in INPUT_COLUMNS]
+        fields += [list(map(repr, values.tolist())) for values in results]
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(zip(*fields))
+        text = buffer.getvalue()
+    else:
+        values = [array.tolist() for array in (principal, rate, time_, n, tax_rate, *results)]
+        text = "".join(json.dumps(dict(zip(OUTPUT_COLUMNS, row))) + "\n" for row in zip(*values))
+    return len(principal), text
+
+
+def evaluate_positions(chunks, input_format, output_format, workers):
+    if workers == 1:
+        for header, chunk in chunks:
+            yield evaluate_chunk(header, chunk, input_format, output_format)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for header, chunk in chunks:
+            pending.append(executor.submit(evaluate_chunk, header, chunk, input_format, output_format))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def peak_rss_mb():
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    largest_child = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return own / scale, largest_child / scale
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Пакетный расчет процентов и налогов по портфелю позиций")
+    parser.add_argument("input", help="CSV или JSONL файл с колонками " + ", ".join(INPUT_COLUMNS))
+    parser.add_argument("-o", "--output", default="-", help="файл результатов (по умолчанию stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="число процессов")
+    parser.add_argument("-c", "--chunk-size", type=int, default=50000, help="строк в одном блоке")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"], help="формат входного файла")
+    parser.add_argument("--output-format", choices=["csv", "jsonl"], help="формат выходного файла")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.workers <= 0 or args.chunk_size <= 0:
+        parser.error("--workers и --chunk-size должны быть положительными")
+
+    input_format = args.input_format or detect_format(args.input)
+    output_format = args.output_format or ("csv" if args.output == "-" else detect_format(args.output))
+
+    started = time.perf_counter()
+    total = 0
+    with open(args.input, newline="", encoding="utf-8") as source:
+        output = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+        try:
+            if output_format == "csv":
+                csv.writer(output, lineterminator="\n").writerow(OUTPUT_COLUMNS)
+            chunks = read_chunks(iter(source), input_format, args.chunk_size)
+            for count, text in evaluate_positions(chunks, input_format, output_format, args.workers):
+                output.write(text)
+                total += count
+        except ValueError as error:
+            print(f"Ошибка: {error}", file=sys.stderr)
+            return 1
+        finally:
+            if output is not sys.stdout:
+                output.close()
+
+    elapsed = time.perf_counter() - started
+    rate = total / elapsed if elapsed > 0 else 0.0
+    own, largest_child = peak_rss_mb()
+    memory = f"пиковая память процесса: {own:.1f} МБ"
+    if args.workers > 1:
+        memory += f", самого большого воркера: {largest_child:.1f} МБ"
+    print(
+        f"Обработано строк: {total}, время: {elapsed:.2f} с, "
+        f"скорость: {rate:,.0f} строк/с, {memory}",
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
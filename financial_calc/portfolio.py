@@ -0,0 +1,133 @@
+import math
+from collections import namedtuple
+
+from calculator import (
+    calculate_compound_interest,
+    calculate_tax,
+    calculate_compound_interest_batch,
+    calculate_tax_batch
+)
+
+
+Position = namedtuple("Position", ["principal", "rate", "time", "n", "tax_rate", "interest", "tax"])
+PortfolioTotals = namedtuple("PortfolioTotals", ["interest", "tax"])
+
+
+def _two_sum(a, b):
+    total = a + b
+    part = total - a
+    return total, (a - (total - part)) + (b - part)
+
+
+class FenwickTree:
+    # Every node keeps the rounding error of its additions (TwoSum) next to
+    # its sum, and prefix sums are added with math.fsum, so long runs of
+    # updates do not drift away from the exact totals.
+    def __init__(self, values=()):
+        self._values = [float(value) for value in values]
+        self._tree = [0.0] + self._values
+        self._errors = [0.0] * len(self._tree)
+        for index in range(1, len(self._tree)):
+            parent = index + (index & -index)
+            if parent < len(self._tree):
+                self._tree[parent], error = _two_sum(self._tree[parent], self._tree[index])
+                self._errors[parent] += error + self._errors[index]
+
+    def __len__(self):
+        return len(self._values)
+
+    def append(self, value):
+        index = len(self._tree)
+        lowest = index & -index
+        value = float(value)
+        terms = [value] + self._terms(index - 1) + [-term for term in self._terms(index - lowest)]
+        node = math.fsum(terms)
+        self._values.append(value)
+        self._tree.append(node)
+        self._errors.append(math.fsum(terms + [-node]))
+
+    def add(self, position, delta):
+        self.set(position, self._values[position] + delta)
+
+    def set(self, position, value):
+        value = float(value)
+        delta, remainder = _two_sum(value, -self._values[position])
+        self._values[position] = value
+        index = position + 1
+        while index < len(self._tree):
+            self._tree[index], error = _two_sum(self._tree[index], delta)
+            self._errors[index] += error + remainder
+            index += index & -index
+
+    def _terms(self, stop):
+        terms = []
+        while stop > 0:
+            terms.append(self._tree[stop])
+            terms.append(self._errors[stop])
+            stop -= stop & -stop
+        return terms
+
+    def prefix_sum(self, stop):
+        return math.fsum(self._terms(stop))
+
+    def range_sum(self, start, stop):
+        return math.fsum(self._terms(stop) + [-term for term in self._terms(start)])
+
+
+class Portfolio:
+    def __init__(self, positions=()):
+        rows = [tuple(position) for position in positions]
+        self._positions = []
+        if rows:
+            principal, rate, time, n, tax_rate = (list(column) for column in zip(*rows))
+            interest = calculate_compound_interest_batch(principal, rate, time, n)
+            tax = calculate_tax_batch(interest, tax_rate)
+            self._positions = [
+                Position(*row, interest=value, tax=tax_value)
+                for row, value, tax_value in zip(rows, interest.tolist(), tax.tolist())
+            ]
+        self._interest = FenwickTree(position.interest for position in self._positions)
+        self._tax = FenwickTree(position.tax for position in self._positions)
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __getitem__(self, index):
+        return self._positions[index]
+
+    def __iter__(self):
+        return iter(self._positions)
+
+    @staticmethod
+    def _evaluate(principal, rate, time, n, tax_rate):
+        interest = calculate_compound_interest(principal, rate, time, n)
+        tax = calculate_tax(interest, tax_rate)
+        return Position(principal, rate, time, n, tax_rate, interest, tax)
+
+    def add(self, principal, rate, time, n=1, tax_rate=0):
+        position = self._evaluate(principal, rate, time, n, tax_rate)
+        self._positions.append(position)
+        self._interest.append(position.interest)
+        self._tax.append(position.tax)
+        return len(self._positions) - 1
+
+    def update(self, index, **changes):
+        old = self._positions[index]
+        index = range(len(self._positions))[index]
+        fields = {name: changes.pop(name, getattr(old, name)) for name in Position._fields[:5]}
+        if changes:
+            raise TypeError(f"Неизвестные поля позиции: {', '.join(changes)}")
+
+        position = self._evaluate(**fields)
+        self._positions[index] = position
+        self._interest.set(index, position.interest)
+        self._tax.set(index, position.tax)
+        return position
+
+    def range_totals(self, start, stop):
+        start, stop, _ = slice(start, stop).indices(len(self._positions))
+        stop = max(start, stop)
+        return PortfolioTotals(self._interest.range_sum(start, stop), self._tax.range_sum(start, stop))
+
+    def totals(self):
+        return self.range_totals(0, len(self._positions))
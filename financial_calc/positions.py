@@ -0,0 +1,64 @@
+import csv
+import json
+from itertools import islice
+
+import numpy as np
+
+
+INPUT_COLUMNS = ["principal", "rate", "time", "n", "tax_rate"]
+DEFAULTS = {"n": "1", "tax_rate": "0"}
+
+
+def read_chunks(lines, input_format, chunk_size):
+    header = None
+    if input_format == "csv":
+        lines = (row for row in csv.reader(lines) if row)
+        header = next(lines, None)
+        if header is None:
+            return
+
+    while True:
+        chunk = list(islice(lines, chunk_size))
+        if not chunk:
+            return
+        yield header, chunk
+
+
+def parse_chunk(header, chunk, input_format):
+    columns = {}
+    if input_format == "csv":
+        rows = chunk
+        for row in rows:
+            if len(row) != len(header):
+                raise ValueError(
+                    f"Неверное число значений в строке {','.join(row)}: ожидалось {len(header)}, получено {len(row)}"
+                )
+        values = list(zip(*rows)) if rows else [()] * len(header)
+        for name in INPUT_COLUMNS:
+            if name in header:
+                columns[name] = values[header.index(name)]
+            elif name in DEFAULTS:
+                columns[name] = [DEFAULTS[name]] * len(rows)
+            else:
+                raise ValueError(f"Отсутствует обязательная колонка: {name}")
+    else:
+        records = [json.loads(line) for line in chunk if line.strip()]
+        for name in INPUT_COLUMNS:
+            try:
+                columns[name] = [record.get(name, DEFAULTS.get(name)) for record in records]
+            except AttributeError:
+                raise ValueError("Каждая позиция должна быть объектом") from None
+            if any(value is None for value in columns[name]):
+                raise ValueError(f"Отсутствует обязательная колонка: {name}")
+
+    n = np.asarray(columns["n"], dtype=np.float64)
+    if np.any(n != np.floor(n)):
+        raise ValueError("n должно быть целым положительным числом")
+
+    return columns, (
+        np.asarray(columns["principal"], dtype=np.float64),
+        np.asarray(columns["rate"], dtype=np.float64),
+        np.asarray(columns["time"], dtype=np.float64),
+        n.astype(np.int64),
+        np.asarray(columns["tax_rate"], dtype=np.float64),
+    )
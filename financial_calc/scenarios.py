@@ -0,0 +1,155 @@
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from amortization import count_periods
+from calculator import calculate_compound_interest
+
+
+MODELS = ("random_walk", "mean_reverting")
+
+ScenarioReport = namedtuple(
+    "ScenarioReport", ["paths", "mean", "std", "minimum", "maximum", "percentiles", "value_at_risk"]
+)
+
+
+class ScenarioStatistics:
+    def __init__(self, low, high, bins):
+        self.low = low
+        self.width = (high - low) / bins
+        self.histogram = np.zeros(bins + 2, dtype=np.int64)
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+
+    def _combine(self, count, mean, m2):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def update(self, values):
+        if len(values) == 0:
+            return
+
+        index = np.floor((values - self.low) / self.width).astype(np.int64) + 1
+        np.clip(index, 0, len(self.histogram) - 1, out=index)
+        self.histogram += np.bincount(index, minlength=len(self.histogram))
+        mean = values.mean()
+        self._combine(len(values), mean, float(((values - mean) ** 2).sum()))
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+
+        self.histogram += other.histogram
+        self._combine(other.count, other.mean, other.m2)
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def std(self):
+        return (self.m2 / self.count) ** 0.5 if self.count else 0.0
+
+    def percentile(self, q):
+        if self.count == 0:
+            return np.nan
+
+        rank = q / 100 * self.count
+        cumulative = np.cumsum(self.histogram)
+        index = min(int(np.searchsorted(cumulative, rank)), len(self.histogram) - 1)
+        if index == 0:
+            return self.minimum
+        if index == len(self.histogram) - 1:
+            return self.maximum
+
+        before = cumulative[index - 1]
+        fraction = (rank - before) / self.histogram[index]
+        value = self.low + (index - 1 + fraction) * self.width
+        return min(max(value, self.minimum), self.maximum)
+
+
+def simulate_final_amounts(principal, rate, time, n=1, size=1, model="random_walk",
+                           volatility=1.0, reversion=0.0, long_term_rate=None, seed=None):
+    calculate_compound_interest(principal, rate, time, n)
+    if model not in MODELS:
+        raise ValueError(f"Неизвестная модель ставки: {model}")
+    if volatility < 0 or reversion < 0:
+        raise ValueError("Аргументы должны быть неотрицательными")
+
+    periods = count_periods(time, n)
+    step = 1 / n
+    shock = volatility * step ** 0.5
+    target = rate if long_term_rate is None else long_term_rate
+    generator = np.random.default_rng(seed)
+
+    rates = np.full(size, float(rate))
+    growth = np.ones(size)
+    for _ in range(periods):
+        growth *= 1 + rates / (100 * n)
+        drift = reversion * (target - rates) * step if model == "mean_reverting" else 0.0
+        rates += drift + shock * generator.standard_normal(size)
+        np.maximum(rates, 0, out=rates)
+
+    return principal * growth
+
+
+def _block_sizes(paths, block_size):
+    return [min(block_size, paths - start) for start in range(0, paths, block_size)]
+
+
+def _simulate_blocks(blocks, low, high, bins, options):
+    statistics = ScenarioStatistics(low, high, bins)
+    for size, seed in blocks:
+        statistics.update(simulate_final_amounts(size=size, seed=seed, **options))
+    return statistics
+
+
+def simulate_rate_scenarios(principal, rate, time, n=1, paths=100000, model="random_walk",
+                            volatility=1.0, reversion=0.0, long_term_rate=None, block_size=10000,
+                            workers=1, seed=0, bins=4096, percentiles=(1, 5, 50, 95, 99), var_level=95):
+    if paths <= 0 or block_size <= 0 or workers <= 0 or bins <= 0:
+        raise ValueError("paths, block_size, workers и bins должны быть положительными")
+    if not 0 < var_level < 100:
+        raise ValueError("Уровень VaR должен быть между 0 и 100")
+
+    options = {
+        "principal": principal, "rate": rate, "time": time, "n": n, "model": model,
+        "volatility": volatility, "reversion": reversion, "long_term_rate": long_term_rate,
+    }
+    seeds = np.random.SeedSequence(seed).spawn(-(-paths // block_size))
+    blocks = list(zip(_block_sizes(paths, block_size), seeds))
+
+    pilot = simulate_final_amounts(size=blocks[0][0], seed=blocks[0][1], **options)
+    spread = max(float(pilot.max() - pilot.min()), abs(float(pilot.mean())) * 1e-9, 1e-9)
+    low, high = float(pilot.min()) - spread, float(pilot.max()) + spread
+
+    statistics = ScenarioStatistics(low, high, bins)
+    statistics.update(pilot)
+    remaining = blocks[1:]
+    if workers == 1 or len(remaining) < 2:
+        statistics.merge(_simulate_blocks(remaining, low, high, bins, options))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_simulate_blocks, remaining[worker::workers], low, high, bins, options)
+                for worker in range(workers)
+            ]
+            for future in futures:
+                statistics.merge(future.result())
+
+    return ScenarioReport(
+        paths=statistics.count,
+        mean=float(statistics.mean),
+        std=float(statistics.std),
+        minimum=statistics.minimum,
+        maximum=statistics.maximum,
+        percentiles={q: float(statistics.percentile(q)) for q in percentiles},
+        value_at_risk=float(statistics.mean - statistics.percentile(100 - var_level)),
+    )
@@ -0,0 +1,105 @@
+from collections import namedtuple
+
+import numpy as np
+
+from calculator import as_float_array, check_n_batch
+
+
+SolverResult = namedtuple("SolverResult", ["value", "converged", "iterations"])
+
+
+def _check_non_negative(*arrays):
+    if any(np.any(values < 0) for values in arrays):
+        raise ValueError("Аргументы должны быть неотрицательными")
+
+
+def solve_compound_rate_batch(principal, interest, time, n=1):
+    principal = as_float_array(principal)
+    interest = as_float_array(interest)
+    time = as_float_array(time)
+    _check_non_negative(principal, interest, time)
+    n = check_n_batch(n)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = 100 * n * np.expm1(np.log1p(interest / principal) / (n * time))
+    return np.where((principal == 0) | (time == 0), np.nan, rate)
+
+
+def solve_compound_time_batch(principal, interest, rate, n=1):
+    principal = as_float_array(principal)
+    interest = as_float_array(interest)
+    rate = as_float_array(rate)
+    _check_non_negative(principal, interest, rate)
+    n = check_n_batch(n)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        time = np.log1p(interest / principal) / (n * np.log1p(rate / (100 * n)))
+    time = np.where(interest == 0, 0.0, time)
+    return np.where((principal == 0) | ((rate == 0) & (interest != 0)), np.nan, time)
+
+
+def calculate_npv_batch(rate, cashflows):
+    rate = as_float_array(rate)
+    cashflows = as_float_array(cashflows)
+    if np.any(rate <= -100):
+        raise ValueError("Ставка дисконтирования должна быть больше -100")
+
+    periods = np.arange(cashflows.shape[-1])
+    discount = (1 + rate[..., None] / 100) ** -periods
+    return (cashflows * discount).sum(axis=-1)
+
+
+def _npv_with_derivative(cashflows, periods, rate):
+    # NPV scaled by base**last when base < 1, so powers never overflow;
+    # the positive factor keeps the sign and the root unchanged.
+    base = 1 + rate[:, None] / 100
+    exponents = np.where(base < 1, periods[-1] - periods, -periods)
+    values = cashflows * base ** exponents
+    npv = values.sum(axis=1)
+    derivative = (values * exponents).sum(axis=1) / (100 * base[:, 0])
+    return npv, derivative
+
+
+def calculate_irr_batch(cashflows, guess=10.0, tol=1e-10, max_iter=100, low=-99.0, high=1000.0):
+    cashflows = as_float_array(cashflows)
+    shape = cashflows.shape[:-1]
+    cashflows = cashflows.reshape(-1, cashflows.shape[-1])
+    periods = np.arange(cashflows.shape[1])
+    count = cashflows.shape[0]
+
+    lower = np.full(count, float(low))
+    upper = np.full(count, float(high))
+    npv_lower, _ = _npv_with_derivative(cashflows, periods, lower)
+    npv_upper, _ = _npv_with_derivative(cashflows, periods, upper)
+    sign_lower = np.sign(npv_lower)
+
+    rate = np.clip(np.broadcast_to(as_float_array(guess), (count,)), low, high)
+    rate = np.where(npv_lower == 0, low, np.where(npv_upper == 0, high, rate))
+    converged = (npv_lower == 0) | (npv_upper == 0)
+    iterations = np.zeros(count, dtype=np.int64)
+    active = np.flatnonzero(~converged & (sign_lower * np.sign(npv_upper) < 0))
+
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+
+        current = rate[active]
+        npv, derivative = _npv_with_derivative(cashflows[active], periods, current)
+        below = np.sign(npv) == sign_lower[active]
+        lower[active] = np.where(below, current, lower[active])
+        upper[active] = np.where(below, upper[active], current)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            candidate = current - npv / derivative
+        outside = ~np.isfinite(candidate) | (candidate <= lower[active]) | (candidate >= upper[active])
+        candidate = np.where(outside, (lower[active] + upper[active]) / 2, candidate)
+        candidate = np.where(npv == 0, current, candidate)
+
+        done = (npv == 0) | (np.abs(candidate - current) <= tol * (1 + np.abs(current)))
+        rate[active] = candidate
+        iterations[active] += 1
+        converged[active[done]] = True
+        active = active[~done]
+
+    rate = np.where(converged, rate, np.nan)
+    return SolverResult(rate.reshape(shape), converged.reshape(shape), iterations.reshape(shape))
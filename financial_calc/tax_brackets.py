@@ -0,0 +1,71 @@
+from bisect import bisect_right
+from functools import lru_cache
+
+import numpy as np
+
+
+class TaxBracketSchedule:
+    def __init__(self, brackets):
+        brackets = [(threshold, rate) for threshold, rate in brackets]
+        if not brackets or brackets[0][0] != 0:
+            raise ValueError("Первая ступень шкалы должна начинаться с 0")
+
+        thresholds = [threshold for threshold, _ in brackets]
+        if any(lower >= upper for lower, upper in zip(thresholds, thresholds[1:])):
+            raise ValueError("Пороги шкалы должны строго возрастать")
+
+        rates = [rate for _, rate in brackets]
+        if any(rate < 0 or rate > 100 for rate in rates):
+            raise ValueError("Налоговая ставка должна быть между 0 и 100")
+
+        cumulative = [0]
+        for lower, upper, rate in zip(thresholds, thresholds[1:], rates):
+            cumulative.append(cumulative[-1] + (upper - lower) * rate / 100)
+
+        self.brackets = tuple(brackets)
+        self._thresholds = thresholds
+        self._fractions = [rate / 100 for rate in rates]
+        self._cumulative = cumulative
+        self._threshold_array = np.asarray(thresholds, dtype=np.float64)
+        self._fraction_array = np.asarray(self._fractions, dtype=np.float64)
+        self._cumulative_array = np.asarray(cumulative, dtype=np.float64)
+
+    def __repr__(self):
+        return f"TaxBracketSchedule({list(self.brackets)!r})"
+
+    def tax(self, amount):
+        if amount < 0:
+            raise ValueError("Аргументы должны быть неотрицательными")
+
+        index = bisect_right(self._thresholds, amount) - 1
+        return self._cumulative[index] + (amount - self._thresholds[index]) * self._fractions[index]
+
+    def tax_batch(self, amounts):
+        amounts = np.asarray(amounts, dtype=np.float64)
+        if np.any(amounts < 0):
+            raise ValueError("Аргументы должны быть неотрицательными")
+
+        index = np.searchsorted(self._threshold_array, amounts, side="right") - 1
+        return (
+            self._cumulative_array[index]
+            + (amounts - self._threshold_array[index]) * self._fraction_array[index]
+        )
+
+
+@lru_cache(maxsize=64)
+def _cached_schedule(brackets):
+    return TaxBracketSchedule(brackets)
+
+
+def get_tax_bracket_schedule(brackets):
+    if isinstance(brackets, TaxBracketSchedule):
+        return brackets
+    return _cached_schedule(tuple((threshold, rate) for threshold, rate in brackets))
+
+
+def calculate_progressive_tax(amount, brackets):
+    return get_tax_bracket_schedule(brackets).tax(amount)
+
+
+def calculate_progressive_tax_batch(amounts, brackets):
+    return get_tax_bracket_schedule(brackets).tax_batch(amounts)
@@ -0,0 +1,165 @@
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from calculator import (
+    calculate_simple_interest,
+    calculate_compound_interest,
+    calculate_tax,
+    calculate_simple_interest_batch,
+    calculate_compound_interest_batch,
+    calculate_tax_batch
+)
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+SIZES = [10 ** power for power in range(8)]
+SCALAR_LIMIT = 10 ** 5
+
+
+def make_inputs(size, seed=0):
+    generator = np.random.default_rng(seed)
+    return {
+        "principal": generator.uniform(0, 1e6, size),
+        "rate": generator.uniform(0, 30, size),
+        "time": generator.uniform(0, 40, size),
+        "n": generator.choice([1, 4, 12], size),
+        "tax_rate": generator.uniform(0, 100, size),
+    }
+
+
+def scalar_cases(inputs):
+    principal = inputs["principal"].tolist()
+    rate = inputs["rate"].tolist()
+    time_ = inputs["time"].tolist()
+    n = inputs["n"].tolist()
+    tax_rate = inputs["tax_rate"].tolist()
+    return {
+        "calculate_simple_interest": lambda: [
+            calculate_simple_interest(p, r, t) for p, r, t in zip(principal, rate, time_)
+        ],
+        "calculate_compound_interest": lambda: [
+            calculate_compound_interest(p, r, t, k) for p, r, t, k in zip(principal, rate, time_, n)
+        ],
+        "calculate_tax": lambda: [calculate_tax(p, r) for p, r in zip(principal, tax_rate)],
+    }
+
+
+def batch_cases(inputs):
+    return {
+        "calculate_simple_interest_batch": lambda: calculate_simple_interest_batch(
+            inputs["principal"], inputs["rate"], inputs["time"]
+        ),
+        "calculate_compound_interest_batch": lambda: calculate_compound_interest_batch(
+            inputs["principal"], inputs["rate"], inputs["time"], inputs["n"]
+        ),
+        "calculate_tax_batch": lambda: calculate_tax_batch(inputs["principal"], inputs["tax_rate"]),
+    }
+
+
+def measure(function, size, min_time=0.2, max_runs=1000):
+    best = None
+    spent = 0
+    runs = 0
+    while runs < max_runs and (runs == 0 or spent < min_time * 1e9):
+        started = time.perf_counter_ns()
+        function()
+        elapsed = time.perf_counter_ns() - started
+        best = elapsed if best is None else min(best, elapsed)
+        spent += elapsed
+        runs += 1
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "size": size,
+        "runs": runs,
+        "ns_per_element": best / size,
+        "peak_bytes": peak,
+        "bytes_per_element": peak / size,
+    }
+
+
+def run_benchmarks(sizes=SIZES, scalar_limit=SCALAR_LIMIT, min_time=0.2):
+    results = {}
+    for size in sizes:
+        inputs = make_inputs(size)
+        cases = dict(batch_cases(inputs))
+        if size <= scalar_limit:
+            cases.update(scalar_cases(inputs))
+        for name, function in cases.items():
+            results[f"{name}[{size}]"] = measure(function, size, min_time)
+    return results
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+
+
+def load_baseline(path=BASELINE_PATH):
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def find_regressions(results, baseline, threshold=0.25):
+    regressions = {}
+    for key, record in results.items():
+        if key not in baseline:
+            continue
+        ratio = record["ns_per_element"] / baseline[key]["ns_per_element"]
+        if ratio > 1 + threshold:
+            regressions[key] = ratio
+    return regressions
+
+
+def print_results(results, baseline=None):
+    print(f"{'benchmark':<45} {'ns/elem':>12} {'bytes/elem':>12} {'vs base':>8}")
+    for key, record in results.items():
+        change = ""
+        if baseline and key in baseline:
+            change = f"{record['ns_per_element'] / baseline[key]['ns_per_element']:.2f}x"
+        print(f"{key:<45} {record['ns_per_element']:>12.2f} {record['bytes_per_element']:>12.2f} {change:>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарки calculator.py и проверка регрессий")
+    parser.add_argument("--max-size", type=int, default=SIZES[-1], help="максимальный размер входа")
+    parser.add_argument("--scalar-limit", type=int, default=SCALAR_LIMIT, help="максимальный размер для скалярных функций")
+    parser.add_argument("--min-time", type=float, default=0.2, help="минимальное время замера, с")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="JSON файл с базовыми результатами")
+    parser.add_argument("--save", action="store_true", help="сохранить результаты как базовые")
+    parser.add_argument("--threshold", type=float, default=0.25, help="допустимое замедление (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    sizes = [size for size in SIZES if size <= args.max_size]
+    results = run_benchmarks(sizes, args.scalar_limit, args.min_time)
+    baseline = load_baseline(args.baseline) if os.path.exists(args.baseline) else None
+    print_results(results, None if args.save else baseline)
+
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f"Базовые результаты сохранены в {args.baseline}")
+        return 0
+    if baseline is None:
+        print(f"Нет базовых результатов {args.baseline}, запустите с --save")
+        return 0
+
+    regressions = find_regressions(results, baseline, args.threshold)
+    for key, ratio in regressions.items():
+        print(f"Регрессия: {key} медленнее в {ratio:.2f} раза", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+import pytest
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from amortization import (
+    calculate_annuity_payment,
+    calculate_annuity_payment_batch,
+    amortization_schedule,
+    amortization_schedule_batch,
+    amortization_table_batch
+)
+
+
+class TestAnnuityPayment:
+    def test_calculate_annuity_payment_positive_values(self):
+        result = calculate_annuity_payment(100000, 12, 1, n=12)
+        rate = 12 / (100 * 12)
+        expected = 100000 * rate / (1 - (1 + rate) ** -12)
+        assert abs(result - expected) < 1e-9
+
+    def test_calculate_annuity_payment_zero_rate(self):
+        result = calculate_annuity_payment(1200, 0, 1, n=12)
+        assert result == 100
+
+    def test_calculate_annuity_payment_invalid_periods(self):
+        with pytest.raises(ValueError, match="n \\* time должно быть целым положительным числом периодов"):
+            calculate_annuity_payment(1000, 5, 0, n=12)
+
+        with pytest.raises(ValueError, match="n \\* time должно быть целым положительным числом периодов"):
+            calculate_annuity_payment(1000, 5, 1.05, n=12)
+
+    def test_calculate_annuity_payment_batch_matches_scalar(self):
+        principal = [100000, 1200, 5000]
+        rate = [12, 0, 7.5]
+        time = [1, 1, 30]
+        result = calculate_annuity_payment_batch(principal, rate, time, n=12)
+        expected = [calculate_annuity_payment(p, r, t, 12) for p, r, t in zip(principal, rate, time)]
+        assert np.allclose(result, expected, rtol=1e-12, atol=0)
+
+
+class TestAmortizationSchedule:
+    def test_amortization_schedule_pays_off_loan(self):
+        rows = list(amortization_schedule(100000, 12, 1, n=12))
+        assert len(rows) == 12
+        assert [row.period for row in rows] == list(range(1, 13))
+        assert rows[-1].balance == 0
+        assert abs(sum(row.principal for row in rows) - 100000) < 1e-6
+        for row in rows:
+            assert abs(row.payment - row.interest - row.principal) < 1e-9
+
+    def test_amortization_schedule_is_lazy(self):
+        schedule = amortization_schedule(100000, 5, 30, n=12)
+        first = next(schedule)
+        assert first.period == 1
+        assert abs(first.interest - 100000 * 5 / 1200) < 1e-9
+
+    def test_amortization_schedule_negative_values(self):
+        with pytest.raises(ValueError, match="Аргументы должны быть неотрицательными"):
+            list(amortization_schedule(-1000, 5, 1, n=12))
+
+        with pytest.raises(ValueError, match="Аргументы должны быть неотрицательными"):
+            list(amortization_schedule_batch([1000, -1000], 5, 1, n=12))
+
+
+class TestAmortizationScheduleBatch:
+    def test_amortization_schedule_batch_matches_scalar(self):
+        principal = np.array([100000, 2500, 1200])
+        rate = np.array([12, 7.5, 0])
+        time = np.array([1, 0.5, 1])
+        for rows in zip(amortization_schedule_batch(principal, rate, time, n=12),
+                        amortization_schedule(100000, 12, 1, n=12)):
+            batch_row, scalar_row = rows
+            assert batch_row.period == scalar_row.period
+            assert np.isclose(batch_row.payment[0], scalar_row.payment, rtol=1e-12)
+            assert np.isclose(batch_row.balance[0], scalar_row.balance, rtol=1e-9, atol=1e-6)
+
+    def test_amortization_table_batch_pads_shorter_loans(self):
+        table = amortization_table_batch([100000, 2500], [12, 7.5], [1, 0.5], n=12)
+        assert table.payment.shape == (2, 12)
+        assert table.period.tolist() == list(range(1, 13))
+        assert np.all(table.payment[1, 6:] == 0)
+        assert np.all(table.balance[:, -1] == 0)
+        assert np.allclose(table.principal.sum(axis=1), [100000, 2500])
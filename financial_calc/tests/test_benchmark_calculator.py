@@ -0,0 +1,46 @@
+import pytest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from benchmark_calculator import (
+    run_benchmarks,
+    save_baseline,
+    load_baseline,
+    find_regressions,
+    main
+)
+
+
+class TestBenchmarkSuite:
+    def test_run_benchmarks_reports_per_element_costs(self):
+        results = run_benchmarks(sizes=[1, 100], scalar_limit=1, min_time=0)
+        assert "calculate_compound_interest_batch[100]" in results
+        assert "calculate_compound_interest[1]" in results
+        assert "calculate_compound_interest[100]" not in results
+        for record in results.values():
+            assert record["ns_per_element"] > 0
+            assert record["bytes_per_element"] >= 0
+
+    def test_find_regressions(self):
+        baseline = {"a[10]": {"ns_per_element": 10.0}, "b[10]": {"ns_per_element": 10.0}}
+        results = {
+            "a[10]": {"ns_per_element": 12.0},
+            "b[10]": {"ns_per_element": 14.0},
+            "c[10]": {"ns_per_element": 99.0},
+        }
+        assert find_regressions(results, baseline, threshold=0.25) == {"b[10]": pytest.approx(1.4)}
+
+    def test_baseline_round_trip_and_gate(self, tmp_path):
+        path = tmp_path / "baseline.json"
+        assert main(["--max-size", "10", "--scalar-limit", "1", "--min-time", "0",
+                     "--baseline", str(path), "--save"]) == 0
+        baseline = load_baseline(path)
+        assert "calculate_tax_batch[10]" in baseline
+
+        for record in baseline.values():
+            record["ns_per_element"] /= 1000
+        save_baseline(baseline, path)
+        assert main(["--max-size", "10", "--scalar-limit", "1", "--min-time", "0",
+                     "--baseline", str(path)]) == 1
@@ -1,13 +1,24 @@
 import pytest
 import os
 import sys
+from array import array
+from decimal import Decimal
+
+import numpy as np
 
 sys.path.insert(0, os.path.abspath('.'))
 
 from calculator import (
     calculate_simple_interest,
     calculate_compound_interest,
-    calculate_tax
+    calculate_tax,
+    calculate_simple_interest_batch,
+    calculate_compound_interest_batch,
+    calculate_tax_batch,
+    calculate_compound_interest_exact,
+    set_growth_factor_cache_size,
+    growth_factor_cache_info,
+    GROWTH_FACTOR_CACHE_SIZE
 )
 
 class TestSimpleInterest:
@@ -117,4 +128,122 @@ class TestTaxCalculator:
             calculate_tax(1000, -5)
         
         with pytest.raises(ValueError, match="Налоговая ставка должна быть между 0 и 100"):
-            calculate_tax(1000, 105)
\ No newline at end of file
+            calculate_tax(1000, 105)
+
+
+class TestSimpleInterestBatch:
+    def test_calculate_simple_interest_batch_matches_scalar(self):
+        principal = [1000, 5000, 0, 1000]
+        rate = [5, 3.5, 5, 0]
+        time = [2, 4, 2, 2]
+        result = calculate_simple_interest_batch(principal, rate, time)
+        expected = [calculate_simple_interest(p, r, t) for p, r, t in zip(principal, rate, time)]
+        assert result.tolist() == expected
+    
+    def test_calculate_simple_interest_batch_buffer_input(self):
+        principal = array("d", [1000, 2000, 3000])
+        result = calculate_simple_interest_batch(principal, 5, 2)
+        assert result.tolist() == [100.0, 200.0, 300.0]
+    
+    def test_calculate_simple_interest_batch_negative_values(self):
+        with pytest.raises(ValueError, match="Аргументы должны быть неотрицательными"):
+            calculate_simple_interest_batch([1000, -1000], 5, 2)
+        
+        with pytest.raises(ValueError, match="Аргументы должны быть неотрицательными"):
+            calculate_simple_interest_batch(1000, np.array([5, -5]), 2)
+
+
+class TestCompoundInterestBatch:
+    def test_calculate_compound_interest_batch_matches_scalar(self):
+        principal = np.array([1000, 1000, 0, 1000, 2500.5])
+        rate = np.array([5, 12, 5, 0, 7.25])
+        time = np.array([2, 1, 2, 2, 30])
+        n = np.array([1, 4, 1, 1, 12])
+        result = calculate_compound_interest_batch(principal, rate, time, n)
+        expected = [
+            calculate_compound_interest(p, r, t, int(k))
+            for p, r, t, k in zip(principal.tolist(), rate.tolist(), time.tolist(), n)
+        ]
+        assert np.allclose(result, expected, rtol=1e-12, atol=0)
+    
+    def test_calculate_compound_interest_batch_zero_values(self):
+        result = calculate_compound_interest_batch([0, 1000, 1000], [5, 0, 5], [2, 2, 0])
+        assert result.tolist() == [0, 0, 0]
+    
+    def test_calculate_compound_interest_batch_negative_values(self):
+        with pytest.raises(ValueError, match="Аргументы должны быть неотрицательными"):
+            calculate_compound_interest_batch([1000, 1000], [5, 5], [2, -2])
+    
+    def test_calculate_compound_interest_batch_invalid_n(self):
+        with pytest.raises(ValueError, match="n должно быть целым положительным числом"):
+            calculate_compound_interest_batch([1000], [5], [2], n=np.array([1, 0]))
+        
+        with pytest.raises(ValueError, match="n должно быть целым положительным числом"):
+            calculate_compound_interest_batch([1000], [5], [2], n=-1)
+        
+        with pytest.raises(ValueError, match="n должно быть целым положительным числом"):
+            calculate_compound_interest_batch([1000], [5], [2], n=1.5)
+
+
+class TestTaxCalculatorBatch:
+    def test_calculate_tax_batch_matches_scalar(self):
+        amount = [1000, 500, 0, 1000, 1000]
+        tax_rate = [20, 7.5, 20, 0, 100]
+        result = calculate_tax_batch(amount, tax_rate)
+        expected = [calculate_tax(a, r) for a, r in zip(amount, tax_rate)]
+        assert result.tolist() == expected
+    
+    def test_calculate_tax_batch_invalid_tax_rate(self):
+        with pytest.raises(ValueError, match="Налоговая ставка должна быть между 0 и 100"):
+            calculate_tax_batch([1000, 1000], [20, -5])
+        
+        with pytest.raises(ValueError, match="Налоговая ставка должна быть между 0 и 100"):
+            calculate_tax_batch([1000, 1000], [20, 105])
+
+
+class TestCompoundInterestExact:
+    def test_calculate_compound_interest_exact_values(self):
+        result = calculate_compound_interest_exact(1000, 5, 2, n=1)
+        assert result == Decimal("102.5")
+        
+        result = calculate_compound_interest_exact(Decimal("1000.00"), "12", "1", n=4)
+        assert result == Decimal("125.50881")
+        
+        result = calculate_compound_interest_exact(1000, 7.5, 30, n=12)
+        assert abs(result - Decimal(calculate_compound_interest(1000, 7.5, 30, n=12))) < Decimal("1e-6")
+    
+    def test_calculate_compound_interest_exact_keeps_full_precision(self):
+        principal = Decimal("123456789012345678901234567890.123")
+        result = calculate_compound_interest_exact(principal, 5, 1)
+        assert result == Decimal("6172839450617283945061728394.50615")
+    
+    def test_calculate_compound_interest_exact_zero_values(self):
+        assert calculate_compound_interest_exact(0, 5, 2) == 0
+        assert calculate_compound_interest_exact(1000, 0, 2) == 0
+        assert calculate_compound_interest_exact(1000, 5, 0) == 0
+    
+    def test_calculate_compound_interest_exact_invalid_arguments(self):
+        with pytest.raises(ValueError, match="Аргументы должны быть неотрицательными"):
+            calculate_compound_interest_exact(-1000, 5, 2)
+        
+        with pytest.raises(ValueError, match="n должно быть целым положительным числом"):
+            calculate_compound_interest_exact(1000, 5, 2, n=1.5)
+        
+        with pytest.raises(ValueError, match="n \\* time должно быть целым числом для точного расчета"):
+            calculate_compound_interest_exact(1000, 5, "0.5", n=1)
+    
+    def test_growth_factor_cache_statistics(self):
+        set_growth_factor_cache_size(2)
+        try:
+            for principal in range(1, 6):
+                calculate_compound_interest_exact(principal, 5, 2, n=12)
+            calculate_compound_interest_exact(1, 6, 2, n=12)
+            calculate_compound_interest_exact(1, 7, 2, n=12)
+            calculate_compound_interest_exact(1, 5, 2, n=12)
+            info = growth_factor_cache_info()
+            assert info.maxsize == 2
+            assert info.hits == 4
+            assert info.misses == 4
+            assert info.currsize == 2
+        finally:
+            set_growth_factor_cache_size(GROWTH_FACTOR_CACHE_SIZE)
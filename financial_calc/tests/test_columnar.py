@@ -0,0 +1,91 @@
+import pytest
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from calculator import calculate_compound_interest_batch
+from columnar import (
+    LOAN_BOOK_SCHEMA,
+    write_columnar,
+    open_columnar,
+    convert_csv,
+    evaluate_columnar
+)
+
+
+class TestColumnarFormat:
+    def test_write_and_open_columnar_round_trip(self, tmp_path):
+        path = tmp_path / "book.fcol"
+        principal = np.array([1000, 2500.5, 0])
+        n = np.array([1, 4, 12], dtype=np.int32)
+        write_columnar(path, {"principal": principal, "n": n})
+
+        columns = open_columnar(path)
+        assert list(columns) == ["principal", "n"]
+        assert columns["principal"].tolist() == principal.tolist()
+        assert columns["n"].dtype == np.int32
+        assert columns["n"].tolist() == [1, 4, 12]
+        assert isinstance(columns["principal"].base, np.memmap)
+
+    def test_columnar_views_are_zero_copy(self, tmp_path):
+        path = tmp_path / "book.fcol"
+        write_columnar(path, {"principal": np.arange(10.0)})
+
+        principal = open_columnar(path)["principal"]
+        assert np.asarray(principal, dtype=np.float64) is principal
+        assert not principal.flags.writeable
+
+    def test_open_columnar_rejects_foreign_file(self, tmp_path):
+        path = tmp_path / "book.fcol"
+        path.write_bytes(b"principal,rate\n1,2\n")
+
+        with pytest.raises(ValueError, match="не является колоночным файлом"):
+            open_columnar(path)
+
+    def test_write_columnar_rejects_unsupported_dtype(self, tmp_path):
+        with pytest.raises(ValueError, match="Недопустимая колонка: n"):
+            write_columnar(tmp_path / "book.fcol", {"n": np.array([1, 2], dtype=np.int8)})
+
+
+class TestColumnarConversion:
+    def test_convert_csv_and_evaluate(self, tmp_path):
+        source = tmp_path / "positions.csv"
+        source.write_text("principal,rate,time,n,tax_rate\n1000,5,2,1,13\n\n2500.5,12,1,4,0\n")
+        book_path = tmp_path / "book.fcol"
+        results_path = tmp_path / "results.fcol"
+
+        assert convert_csv(source, book_path, chunk_size=1) == 2
+        book = open_columnar(book_path)
+        assert {name: values.dtype for name, values in book.items()} == LOAN_BOOK_SCHEMA
+        assert book["principal"].tolist() == [1000, 2500.5]
+
+        assert evaluate_columnar(book_path, results_path, chunk_size=1) == 2
+        results = open_columnar(results_path)
+        expected = calculate_compound_interest_batch([1000, 2500.5], [5, 12], [2, 1], [1, 4])
+        assert results["compound_interest"].tolist() == expected.tolist()
+        assert np.allclose(results["tax"], expected * [0.13, 0])
+        assert np.allclose(results["after_tax_interest"], expected * [0.87, 1])
+
+    def test_convert_empty_csv(self, tmp_path):
+        source = tmp_path / "positions.csv"
+        source.write_text("principal,rate,time\n")
+
+        assert convert_csv(source, tmp_path / "book.fcol") == 0
+        assert len(open_columnar(tmp_path / "book.fcol")["principal"]) == 0
+
+    def test_convert_csv_with_multiline_field(self, tmp_path):
+        source = tmp_path / "positions.csv"
+        source.write_text('principal,rate,time\n"1000\n",5,2\n2000,5,1\n')
+
+        assert convert_csv(source, tmp_path / "book.fcol", chunk_size=1) == 2
+        assert open_columnar(tmp_path / "book.fcol")["principal"].tolist() == [1000, 2000]
+
+    def test_convert_csv_rejects_n_outside_int32(self, tmp_path):
+        source = tmp_path / "positions.csv"
+        source.write_text(f"principal,rate,time,n\n1000,5,2,{2 ** 31}\n")
+
+        with pytest.raises(ValueError, match="Значения колонки n не помещаются в int32"):
+            convert_csv(source, tmp_path / "book.fcol")
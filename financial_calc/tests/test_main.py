@@ -0,0 +1,97 @@
+import pytest
+import csv
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from calculator import calculate_compound_interest, calculate_tax
+from main import evaluate_chunk, main
+
+
+POSITIONS = [
+    {"principal": 1000, "rate": 5, "time": 2, "n": 1, "tax_rate": 13},
+    {"principal": 2500.5, "rate": 12, "time": 1, "n": 4, "tax_rate": 0},
+    {"principal": 0, "rate": 7, "time": 3, "n": 12, "tax_rate": 20},
+]
+
+
+def write_csv(path, positions):
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=list(positions[0]))
+        writer.writeheader()
+        writer.writerows(positions)
+
+
+class TestPortfolioCli:
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_main_csv_to_csv(self, tmp_path, capsys, workers):
+        source = tmp_path / "positions.csv"
+        target = tmp_path / "results.csv"
+        write_csv(source, POSITIONS)
+
+        assert main([str(source), "-o", str(target), "-w", str(workers), "-c", "2"]) == 0
+
+        with open(target, newline="") as file:
+            rows = list(csv.DictReader(file))
+        assert len(rows) == len(POSITIONS)
+        for row, position in zip(rows, POSITIONS):
+            compound = calculate_compound_interest(
+                position["principal"], position["rate"], position["time"], position["n"]
+            )
+            tax = calculate_tax(compound, position["tax_rate"])
+            assert abs(float(row["compound_interest"]) - compound) < 1e-9
+            assert abs(float(row["tax"]) - tax) < 1e-9
+            assert abs(float(row["after_tax_interest"]) - (compound - tax)) < 1e-9
+
+        err = capsys.readouterr().err
+        assert "пиковая память процесса" in err
+        assert ("самого большого воркера" in err) == (workers > 1)
+
+    def test_csv_output_quotes_fields(self):
+        count, text = evaluate_chunk(["principal", "rate", "time"], [["1000\n", "5", "2"]], "csv", "csv")
+
+        rows = list(csv.reader(text.splitlines(keepends=True)))
+        assert count == 1
+        assert len(rows) == 1
+        assert rows[0][0] == "1000\n"
+        assert float(rows[0][5]) == 100
+
+    def test_main_reads_quoted_multiline_fields(self, tmp_path):
+        source = tmp_path / "positions.csv"
+        target = tmp_path / "results.csv"
+        source.write_text('principal,rate,time\n"1000\n",5,2\n2000,5,1\n')
+
+        assert main([str(source), "-o", str(target), "-w", "1", "-c", "1"]) == 0
+
+        with open(target, newline="") as file:
+            rows = list(csv.DictReader(file))
+        assert [row["principal"] for row in rows] == ["1000\n", "2000"]
+        assert [float(row["simple_interest"]) for row in rows] == [100, 100]
+
+    def test_main_rejects_ragged_rows(self, tmp_path, capsys):
+        source = tmp_path / "positions.csv"
+        source.write_text("principal,rate,time\n1000,5,2\n2000,5\n")
+
+        assert main([str(source), "-o", str(tmp_path / "results.csv"), "-w", "1"]) == 1
+        assert "ожидалось 3, получено 2" in capsys.readouterr().err
+
+    def test_main_jsonl_defaults(self, tmp_path):
+        source = tmp_path / "positions.jsonl"
+        target = tmp_path / "results.jsonl"
+        source.write_text('{"principal": 1000, "rate": 5, "time": 2}\n')
+
+        assert main([str(source), "-o", str(target), "-w", "1"]) == 0
+
+        result = json.loads(target.read_text())
+        assert result["n"] == 1
+        assert result["tax"] == 0
+        assert result["simple_interest"] == 100
+
+    def test_main_invalid_positions(self, tmp_path, capsys):
+        source = tmp_path / "positions.csv"
+        write_csv(source, [{"principal": -1000, "rate": 5, "time": 2}])
+
+        assert main([str(source), "-o", str(tmp_path / "results.csv"), "-w", "1"]) == 1
+        assert "Аргументы должны быть неотрицательными" in capsys.readouterr().err
@@ -0,0 +1,93 @@
+import pytest
+import math
+import os
+import sys
+import random
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from calculator import calculate_compound_interest, calculate_tax
+from portfolio import FenwickTree, Portfolio
+
+
+POSITIONS = [
+    (1000, 5, 2, 1, 13),
+    (2500.5, 12, 1, 4, 0),
+    (0, 7, 3, 12, 20),
+    (100000, 3.5, 30, 12, 35),
+    (500, 0, 5, 1, 10),
+]
+
+
+class TestFenwickTree:
+    def test_range_sum_matches_naive(self):
+        rng = random.Random(37)
+        values = [rng.uniform(-100, 100) for _ in range(37)]
+        tree = FenwickTree(values)
+        for start in range(len(values)):
+            for stop in range(start, len(values) + 1):
+                assert tree.range_sum(start, stop) == pytest.approx(sum(values[start:stop]), abs=1e-9)
+
+    def test_append_and_add(self):
+        values = []
+        tree = FenwickTree()
+        for value in range(1, 20):
+            tree.append(float(value))
+            values.append(float(value))
+        tree.add(5, 100)
+        values[5] += 100
+        assert len(tree) == len(values)
+        for stop in range(len(values) + 1):
+            assert tree.prefix_sum(stop) == sum(values[:stop])
+
+
+    def test_updates_do_not_accumulate_rounding_error(self):
+        rng = random.Random(8)
+        values = [rng.uniform(0, 1e12) for _ in range(64)]
+        tree = FenwickTree(values)
+        for _ in range(5000):
+            position = rng.randrange(len(values))
+            values[position] = rng.uniform(0, 1e12)
+            tree.set(position, values[position])
+        for position in range(len(values)):
+            values[position] = rng.uniform(0, 1)
+            tree.set(position, values[position])
+        tree.append(0.5)
+        values.append(0.5)
+        assert tree.prefix_sum(len(values)) == pytest.approx(math.fsum(values), rel=1e-15)
+        assert tree.range_sum(10, 20) == pytest.approx(math.fsum(values[10:20]), rel=1e-15)
+
+
+class TestPortfolio:
+    def test_positions_are_evaluated_on_load(self):
+        portfolio = Portfolio(POSITIONS)
+        assert len(portfolio) == len(POSITIONS)
+        for position, row in zip(portfolio, POSITIONS):
+            interest = calculate_compound_interest(*row[:4])
+            assert position.interest == pytest.approx(interest, rel=1e-12, abs=1e-12)
+            assert position.tax == pytest.approx(calculate_tax(interest, row[4]), rel=1e-12, abs=1e-12)
+
+    def test_range_totals_follow_updates(self):
+        portfolio = Portfolio(POSITIONS)
+        portfolio.update(1, rate=6, tax_rate=20)
+        index = portfolio.add(2000, 4, 3, n=4, tax_rate=15)
+        assert index == len(POSITIONS)
+
+        interests = [position.interest for position in portfolio]
+        taxes = [position.tax for position in portfolio]
+        for start in range(len(portfolio)):
+            for stop in range(start, len(portfolio) + 1):
+                totals = portfolio.range_totals(start, stop)
+                assert totals.interest == pytest.approx(sum(interests[start:stop]), abs=1e-6)
+                assert totals.tax == pytest.approx(sum(taxes[start:stop]), abs=1e-6)
+        assert portfolio.totals().interest == pytest.approx(sum(interests), abs=1e-6)
+
+    def test_update_validates_position(self):
+        portfolio = Portfolio(POSITIONS)
+        with pytest.raises(ValueError, match="Аргументы должны быть неотрицательными"):
+            portfolio.update(0, principal=-1)
+
+        with pytest.raises(TypeError, match="Неизвестные поля позиции: interest"):
+            portfolio.update(0, interest=1)
+
+        assert portfolio[0].principal == 1000
@@ -0,0 +1,59 @@
+import pytest
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from calculator import calculate_compound_interest
+from scenarios import ScenarioStatistics, simulate_final_amounts, simulate_rate_scenarios
+
+
+class TestScenarioStatistics:
+    def test_streaming_statistics_match_numpy(self):
+        values = np.random.default_rng(1).normal(1000, 50, 100000)
+        statistics = ScenarioStatistics(700, 1300, 8192)
+        for block in np.array_split(values, 7):
+            part = ScenarioStatistics(700, 1300, 8192)
+            part.update(block)
+            statistics.merge(part)
+
+        assert statistics.count == len(values)
+        assert statistics.mean == pytest.approx(values.mean())
+        assert statistics.std == pytest.approx(values.std())
+        for q in (1, 50, 99):
+            assert statistics.percentile(q) == pytest.approx(np.percentile(values, q), abs=0.2)
+
+
+class TestRateScenarios:
+    def test_zero_volatility_matches_compound_interest(self):
+        expected = 1000 + calculate_compound_interest(1000, 5, 10, 12)
+        amounts = simulate_final_amounts(1000, 5, 10, 12, size=3, volatility=0)
+        assert np.allclose(amounts, expected, rtol=1e-12)
+
+        report = simulate_rate_scenarios(1000, 5, 10, 12, paths=1000, volatility=0)
+        assert report.mean == pytest.approx(expected)
+        assert report.value_at_risk == pytest.approx(0, abs=1e-9)
+
+    def test_rates_never_become_negative(self):
+        amounts = simulate_final_amounts(1000, 0.1, 5, 12, size=1000, volatility=5, seed=3)
+        assert np.all(amounts >= 1000)
+
+    def test_runs_are_reproducible_across_workers(self):
+        options = dict(paths=4000, block_size=500, volatility=2, model="mean_reverting", reversion=0.5, seed=7)
+        single = simulate_rate_scenarios(1000, 5, 2, 12, workers=1, **options)
+        parallel = simulate_rate_scenarios(1000, 5, 2, 12, workers=2, **options)
+        assert single.paths == parallel.paths == 4000
+        assert single.mean == pytest.approx(parallel.mean, rel=1e-12)
+        assert single.percentiles == pytest.approx(parallel.percentiles, rel=1e-12)
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError, match="Аргументы должны быть неотрицательными"):
+            simulate_rate_scenarios(-1000, 5, 2, paths=10)
+
+        with pytest.raises(ValueError, match="Неизвестная модель ставки"):
+            simulate_rate_scenarios(1000, 5, 2, paths=10, model="jump")
+
+        with pytest.raises(ValueError, match="Уровень VaR должен быть между 0 и 100"):
+            simulate_rate_scenarios(1000, 5, 2, paths=10, var_level=100)
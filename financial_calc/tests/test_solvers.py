@@ -0,0 +1,80 @@
+import pytest
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from calculator import calculate_compound_interest, calculate_compound_interest_batch
+from solvers import (
+    solve_compound_rate_batch,
+    solve_compound_time_batch,
+    calculate_npv_batch,
+    calculate_irr_batch
+)
+
+
+class TestCompoundSolvers:
+    def test_solve_compound_rate_batch_inverts_compound_interest(self):
+        principal = np.array([1000, 2500.5, 100000])
+        rate = np.array([5, 12, 0.5])
+        time = np.array([2, 1, 30])
+        n = np.array([1, 4, 12])
+        interest = calculate_compound_interest_batch(principal, rate, time, n)
+        assert np.allclose(solve_compound_rate_batch(principal, interest, time, n), rate, rtol=1e-10)
+
+    def test_solve_compound_time_batch_inverts_compound_interest(self):
+        interest = calculate_compound_interest(1000, 7, 12.5, 12)
+        result = solve_compound_time_batch([1000, 1000], [interest, 0], [7, 7], 12)
+        assert np.allclose(result, [12.5, 0], rtol=1e-10)
+
+    def test_solvers_return_nan_without_solution(self):
+        assert np.isnan(solve_compound_rate_batch(0, 100, 2))
+        assert np.isnan(solve_compound_rate_batch(1000, 100, 0))
+        assert np.isnan(solve_compound_time_batch(1000, 100, 0))
+
+    def test_solvers_validate_arguments(self):
+        with pytest.raises(ValueError, match="Аргументы должны быть неотрицательными"):
+            solve_compound_rate_batch([1000, 1000], [100, -100], 2)
+
+        with pytest.raises(ValueError, match="n должно быть целым положительным числом"):
+            solve_compound_time_batch(1000, 100, 5, n=0)
+
+
+class TestCashflowSolvers:
+    def test_calculate_npv_batch(self):
+        result = calculate_npv_batch([10, 0], [[-100, 110], [-100, 50]])
+        assert np.allclose(result, [0, -50])
+
+    def test_calculate_irr_batch(self):
+        cashflows = np.array([
+            [-100, 110, 0],
+            [-1000, 300, 800],
+            [-1000, 0, 1210],
+        ])
+        result = calculate_irr_batch(cashflows)
+        assert result.converged.all()
+        assert np.allclose(calculate_npv_batch(result.value, cashflows), 0, atol=1e-6)
+        assert np.isclose(result.value[0], 10)
+        assert np.isclose(result.value[2], 10)
+        assert result.iterations.max() < 100
+
+    def test_calculate_irr_batch_solves_long_streams(self):
+        cashflows = np.full((2, 361), 1000.0)
+        cashflows[:, 0] = [-150000, -500000]
+        with np.errstate(over="raise", invalid="raise"):
+            result = calculate_irr_batch(cashflows)
+        assert result.converged.all()
+        assert np.allclose(calculate_npv_batch(result.value, cashflows), 0, atol=1e-6)
+        assert result.value[1] < 0
+
+    def test_calculate_irr_batch_marks_unsolvable_streams(self):
+        result = calculate_irr_batch([[-100, 110], [100, 50]])
+        assert result.converged.tolist() == [True, False]
+        assert np.isnan(result.value[1])
+
+    def test_calculate_irr_batch_respects_iteration_cap(self):
+        result = calculate_irr_batch([-100, 110], max_iter=1, guess=500)
+        assert result.iterations == 1
+        assert not result.converged
@@ -0,0 +1,75 @@
+import pytest
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath('.'))
+
+from calculator import calculate_tax
+from tax_brackets import (
+    TaxBracketSchedule,
+    get_tax_bracket_schedule,
+    calculate_progressive_tax,
+    calculate_progressive_tax_batch
+)
+
+
+BRACKETS = [(0, 0), (10000, 13), (50000, 20), (200000, 35)]
+
+
+def naive_progressive_tax(amount, brackets):
+    tax = 0
+    bounds = [threshold for threshold, _ in brackets[1:]] + [float("inf")]
+    for (threshold, rate), upper in zip(brackets, bounds):
+        if amount > threshold:
+            tax += calculate_tax(min(amount, upper) - threshold, rate)
+    return tax
+
+
+class TestTaxBracketSchedule:
+    def test_tax_matches_naive_evaluation(self):
+        schedule = TaxBracketSchedule(BRACKETS)
+        for amount in [0, 5000, 10000, 10001, 49999.5, 50000, 120000, 200000, 1e7]:
+            assert abs(schedule.tax(amount) - naive_progressive_tax(amount, BRACKETS)) < 1e-6
+
+    def test_flat_schedule_matches_calculate_tax(self):
+        schedule = TaxBracketSchedule([(0, 20)])
+        assert schedule.tax(1000) == calculate_tax(1000, 20)
+
+    def test_tax_batch_matches_scalar(self):
+        schedule = TaxBracketSchedule(BRACKETS)
+        amounts = np.array([0, 5000, 10000, 10001, 49999.5, 50000, 120000, 200000, 1e7])
+        result = schedule.tax_batch(amounts)
+        assert np.allclose(result, [schedule.tax(amount) for amount in amounts.tolist()], rtol=1e-12)
+
+    def test_invalid_schedules(self):
+        with pytest.raises(ValueError, match="Первая ступень шкалы должна начинаться с 0"):
+            TaxBracketSchedule([(100, 13)])
+
+        with pytest.raises(ValueError, match="Пороги шкалы должны строго возрастать"):
+            TaxBracketSchedule([(0, 0), (100, 13), (100, 20)])
+
+        with pytest.raises(ValueError, match="Налоговая ставка должна быть между 0 и 100"):
+            TaxBracketSchedule([(0, 0), (100, 105)])
+
+    def test_negative_amounts(self):
+        schedule = TaxBracketSchedule(BRACKETS)
+        with pytest.raises(ValueError, match="Аргументы должны быть неотрицательными"):
+            schedule.tax(-1)
+
+        with pytest.raises(ValueError, match="Аргументы должны быть неотрицательными"):
+            schedule.tax_batch([100, -1])
+
+
+class TestProgressiveTax:
+    def test_schedules_are_cached_by_definition(self):
+        first = get_tax_bracket_schedule(BRACKETS)
+        second = get_tax_bracket_schedule([list(bracket) for bracket in BRACKETS])
+        assert first is second
+        assert get_tax_bracket_schedule(first) is first
+
+    def test_calculate_progressive_tax(self):
+        assert calculate_progressive_tax(60000, BRACKETS) == pytest.approx(40000 * 0.13 + 10000 * 0.20)
+        result = calculate_progressive_tax_batch([0, 60000], BRACKETS)
+        assert np.allclose(result, [0, 40000 * 0.13 + 10000 * 0.20])
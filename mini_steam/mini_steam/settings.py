@@ -41,6 +41,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'steam.middleware.SQLInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -82,6 +83,34 @@ DATABASES = {
 }
 
 
+# SQL instrumentation (steam.middleware.SQLInstrumentationMiddleware)
+
+SQL_INSTRUMENTATION_REPEAT_LIMIT = 5
+SQL_INSTRUMENTATION_LOG = False
+
+
+# Achievement event ingestion (steam.ingest.AchivmentEventBuffer)
+
+ACHIVMENT_INGEST_FLUSH_SIZE = 1000
+ACHIVMENT_INGEST_FLUSH_INTERVAL = 1.0
+ACHIVMENT_INGEST_MAX_PENDING = 100000
+
+# Game servers authenticate with "Authorization: Bearer <token>" instead of
+# a session and a CSRF token: {token: username}.
+ACHIVMENT_INGEST_TOKENS = {}
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'mini_steam',
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
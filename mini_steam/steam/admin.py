@@ -1,19 +1,48 @@
 from django.contrib import admin
 from steam.models import Game, Achivments, UserAchivment, Order
+from steam.pagination import EstimatedCountPaginator
+from steam.search import filter_games, prefix_filter
 # Register your models here.
 
+class SteamModelAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        return prefix_filter(queryset, self.search_fields[0], search_term), False
+
 @admin.register(Game)
-class SteamAdmin(admin.ModelAdmin):
-    ...
+class GameAdmin(SteamModelAdmin):
+    list_display = ("id", "name", "price")
+    search_fields = ("name",)
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return filter_games(queryset, search_term), False
 
 @admin.register(Achivments)
-class AchivmentsAdmin(admin.ModelAdmin):
-    ...
+class AchivmentsAdmin(SteamModelAdmin):
+    list_display = ("id", "name_achivments", "game_name")
+    list_select_related = ("game_name",)
+    autocomplete_fields = ("game_name",)
+    search_fields = ("name_achivments",)
 
 @admin.register(UserAchivment)
-class AchivmentsAdmin(admin.ModelAdmin):
-    ...
+class UserAchivmentAdmin(SteamModelAdmin):
+    list_display = ("id", "user_id", "achivment_id", "status")
+    list_select_related = ("user_id", "achivment_id")
+    raw_id_fields = ("user_id",)
+    autocomplete_fields = ("achivment_id",)
+    search_fields = ("user_id__username",)
 
 @admin.register(Order)
-class AchivmentsAdmin(admin.ModelAdmin):
-    ...
\ No newline at end of file
+class OrderAdmin(SteamModelAdmin):
+    list_display = ("id", "game_id", "user_id", "price", "created_at")
+    list_select_related = ("game_id", "user_id")
+    raw_id_fields = ("user_id",)
+    autocomplete_fields = ("game_id",)
+    search_fields = ("user_id__username",)
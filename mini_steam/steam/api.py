@@ -0,0 +1,94 @@
+from django.db.models import F
+from django.http import Http404, JsonResponse
+from django.views.decorators.http import require_GET
+
+from .models import AchivmentStatus, Game, Achivments, UserAchivment, Order
+from .pagination import akeyset_paginate_values
+
+
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 500
+
+GAME_FIELDS = ("name", "price")
+ACHIVMENT_FIELDS = ("description",)
+ACHIVMENT_EXPRESSIONS = {"game": F("game_name_id"), "name": F("name_achivments")}
+
+
+async def paginate(request, queryset, fields, expressions=None, transform=None):
+    try:
+        data = await akeyset_paginate_values(
+            request, queryset, fields, expressions, page_size=API_PAGE_SIZE, max_page_size=API_MAX_PAGE_SIZE
+        )
+    except ValueError as error:
+        return JsonResponse({"detail": str(error)}, status=400)
+    if transform is not None:
+        data["results"] = [transform(row) for row in data["results"]]
+    return JsonResponse(data)
+
+
+async def owner_or_staff_error(request, user_pk):
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({"detail": "Требуется авторизация"}, status=401)
+    if user.pk != user_pk and not user.is_staff:
+        return JsonResponse({"detail": "Недостаточно прав"}, status=403)
+    return None
+
+
+def status_name(row):
+    row["status"] = AchivmentStatus(row["status"]).name.lower()
+    return row
+
+
+@require_GET
+async def games(request):
+    return await paginate(request, Game.objects.all(), GAME_FIELDS)
+
+
+@require_GET
+async def game(request, pk):
+    data = await Game.objects.filter(pk=pk).values("id", "description", *GAME_FIELDS).afirst()
+    if data is None:
+        raise Http404("Игра не найдена")
+
+    achivments = Achivments.objects.filter(game_name_id=pk).order_by("pk")
+    data["achivments"] = [row async for row in achivments.values("id", *ACHIVMENT_FIELDS, **ACHIVMENT_EXPRESSIONS)]
+    return JsonResponse(data)
+
+
+@require_GET
+async def achivments(request):
+    queryset = Achivments.objects.all()
+    if request.GET.get("game"):
+        try:
+            queryset = queryset.filter(game_name_id=int(request.GET["game"]))
+        except ValueError:
+            raise Http404("Некорректный идентификатор игры")
+    return await paginate(request, queryset, ACHIVMENT_FIELDS, ACHIVMENT_EXPRESSIONS)
+
+
+@require_GET
+async def user_achivments(request, user_pk):
+    error = await owner_or_staff_error(request, user_pk)
+    if error is not None:
+        return error
+
+    queryset = UserAchivment.objects.filter(user_id_id=user_pk)
+    return await paginate(request, queryset, ("status",), {
+        "achivment": F("achivment_id_id"),
+        "achivment_name": F("achivment_id__name_achivments"),
+        "game": F("achivment_id__game_name_id"),
+    }, transform=status_name)
+
+
+@require_GET
+async def user_orders(request, user_pk):
+    error = await owner_or_staff_error(request, user_pk)
+    if error is not None:
+        return error
+
+    queryset = Order.objects.filter(user_id_id=user_pk)
+    return await paginate(request, queryset, ("price",), {
+        "game": F("game_id_id"),
+        "game_name": F("game_id__name"),
+    })
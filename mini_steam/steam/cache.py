@@ -0,0 +1,115 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.core.cache import cache
+
+
+PAGE_TIMEOUT = 300
+CACHED_PAGES = ("game_list", "game_detail")
+
+GENERATION_KEY = "steam:version:all"
+CATALOG_VERSION_KEY = "steam:version:catalog"
+
+
+def game_version_key(pk):
+    return f"steam:version:game:{pk}"
+
+
+def completion_version_key(pk):
+    return f"steam:version:completion:{pk}"
+
+
+def _initial_version():
+    return time.time_ns()
+
+
+def get_versions(keys):
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _initial_version(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_version(), None)
+
+
+def invalidate_catalog():
+    bump_version(CATALOG_VERSION_KEY)
+
+
+def invalidate_game(pk):
+    if pk is not None:
+        bump_version(game_version_key(pk))
+
+
+def invalidate_completion(pks):
+    for pk in pks:
+        if pk is not None:
+            bump_version(completion_version_key(pk))
+
+
+def invalidate_all():
+    bump_version(GENERATION_KEY)
+
+
+def _count(name, outcome):
+    key = f"steam:stats:{name}:{outcome}"
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def cache_stats():
+    keys = [f"steam:stats:{name}:{outcome}" for name in CACHED_PAGES for outcome in ("hits", "misses")]
+    counters = cache.get_many(keys)
+    stats = {}
+    for name in CACHED_PAGES:
+        hits = counters.get(f"steam:stats:{name}:hits", 0)
+        misses = counters.get(f"steam:stats:{name}:misses", 0)
+        total = hits + misses
+        stats[name] = {"hits": hits, "misses": misses, "hit_rate": hits / total if total else 0.0}
+    return stats
+
+
+def cached_result(name, version_keys, compute, timeout=PAGE_TIMEOUT):
+    versions = get_versions([GENERATION_KEY] + version_keys)
+    key = f"steam:{name}:{'.'.join(map(str, versions))}"
+    result = cache.get(key)
+    if result is None:
+        result = compute()
+        cache.set(key, result, timeout)
+    return result
+
+
+def cached_page(name, version_keys, params=()):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(request, *args, **kwargs)
+
+            versions = get_versions([GENERATION_KEY] + version_keys(*args, **kwargs))
+            values = [request.path] + [f"{param}={request.GET.get(param, '')}" for param in params]
+            path = hashlib.md5("&".join(values).encode()).hexdigest()
+            key = f"steam:page:{name}:{'.'.join(map(str, versions))}:{path}"
+            response = cache.get(key)
+            if response is not None:
+                _count(name, "hits")
+                return response
+
+            _count(name, "misses")
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response, PAGE_TIMEOUT)
+            return response
+        return wrapper
+    return decorator
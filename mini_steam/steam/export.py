@@ -0,0 +1,95 @@
+import csv
+import io
+import json
+
+from django.db.models import Case, CharField, Value, When
+
+from .models import AchivmentStatus, UserAchivment, Order
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+STATUS_NAME = Case(
+    *[When(status=status, then=Value(status.name.lower())) for status in AchivmentStatus],
+    output_field=CharField(),
+)
+
+EXPORTS = {
+    "orders": (Order, {
+        "id": "id",
+        "game": "game_id_id",
+        "game_name": "game_id__name",
+        "user": "user_id__username",
+        "price": "price",
+        "created_at": "created_at",
+    }),
+    "user_achivments": (UserAchivment, {
+        "id": "id",
+        "user": "user_id__username",
+        "achivment": "achivment_id_id",
+        "achivment_name": "achivment_id__name_achivments",
+        "status": STATUS_NAME,
+    }),
+}
+
+
+def export_rows(name, chunk_size=EXPORT_CHUNK_SIZE):
+    model, columns = EXPORTS[name]
+    queryset = model.objects.order_by("pk").values_list(*columns.values())
+    return list(columns), queryset.iterator(chunk_size=chunk_size)
+
+
+def _drain(buffer):
+    value = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return value
+
+
+def render_csv(columns, rows, chunk_size=EXPORT_CHUNK_SIZE):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield _drain(buffer)
+
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+        if count == chunk_size:
+            yield _drain(buffer)
+            count = 0
+    if count:
+        yield _drain(buffer)
+
+
+def render_ndjson(columns, rows, chunk_size=EXPORT_CHUNK_SIZE):
+    lines = []
+    size = 1
+    for row in rows:
+        lines.append(json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=str))
+        if len(lines) == size:
+            lines.append("")
+            yield "\n".join(lines)
+            lines = []
+            size = chunk_size
+    if lines:
+        lines.append("")
+        yield "\n".join(lines)
+
+
+FORMATS = {
+    "csv": (render_csv, "text/csv; charset=utf-8"),
+    "ndjson": (render_ndjson, "application/x-ndjson; charset=utf-8"),
+}
+
+
+def export_table(name, format, chunk_size=EXPORT_CHUNK_SIZE):
+    if name not in EXPORTS:
+        raise ValueError(f"Неизвестная таблица: {name}")
+    if format not in FORMATS:
+        raise ValueError(f"Неизвестный формат: {format}")
+
+    render, content_type = FORMATS[format]
+    columns, rows = export_rows(name, chunk_size)
+    return render(columns, rows, chunk_size), content_type
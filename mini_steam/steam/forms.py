@@ -1,6 +1,7 @@
 from django import forms
 from django.contrib.auth.models import User
 from .models import Game, Achivments, UserAchivment, Order
+from .widgets import AutocompleteSelect
 
 class GameForm(forms.ModelForm):
     class Meta:
@@ -20,7 +21,7 @@ class AchivmentsForm(forms.ModelForm):
         model = Achivments
         fields = ['game_name', 'name_achivments', 'description']
         widgets = {
-            'game_name': forms.Select(attrs={'class': 'form-control'}),
+            'game_name': AutocompleteSelect('autocomplete_games', attrs={'class': 'form-control'}),
             'name_achivments': forms.TextInput(attrs={'class': 'form-control'}),
             'description': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
         }
@@ -33,9 +34,9 @@ class UserAchivmentForm(forms.ModelForm):
         model = UserAchivment
         fields = ['user_id', 'achivment_id', 'status']
         widgets = {
-            'user_id': forms.Select(attrs={'class': 'form-control'}),
-            'achivment_id': forms.Select(attrs={'class': 'form-control'}),
-            'status': forms.TextInput(attrs={'class': 'form-control'}),
+            'user_id': AutocompleteSelect('autocomplete_users', attrs={'class': 'form-control'}),
+            'achivment_id': AutocompleteSelect('autocomplete_achivments', attrs={'class': 'form-control'}),
+            'status': forms.Select(attrs={'class': 'form-control'}),
         }
     
     def __init__(self, *args, **kwargs):
@@ -46,8 +47,8 @@ class OrderForm(forms.ModelForm):
         model = Order
         fields = ['game_id', 'user_id', 'price']
         widgets = {
-            'game_id': forms.Select(attrs={'class': 'form-control'}),
-            'user_id': forms.Select(attrs={'class': 'form-control'}),
+            'game_id': AutocompleteSelect('autocomplete_games', attrs={'class': 'form-control'}),
+            'user_id': AutocompleteSelect('autocomplete_users', attrs={'class': 'form-control'}),
             'price': forms.NumberInput(attrs={'class': 'form-control'}),
         }
     
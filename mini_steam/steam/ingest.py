@@ -0,0 +1,196 @@
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import IntegrityError, connection, transaction
+
+from .leaderboard import apply_changes, is_unlocked
+from .models import AchivmentStatus, Achivments, UserAchivment
+
+
+logger = logging.getLogger("steam.ingest")
+
+STATUS_NAMES = {status.name.lower(): status for status in AchivmentStatus}
+STATUS_NAMES.update({"done": AchivmentStatus.UNLOCKED, "true": AchivmentStatus.UNLOCKED, "new": AchivmentStatus.LOCKED})
+
+
+def parse_status(value):
+    if isinstance(value, str):
+        value = value.strip().lower()
+        if value in STATUS_NAMES:
+            return STATUS_NAMES[value]
+        if value.isdigit():
+            value = int(value)
+    if not isinstance(value, bool) and isinstance(value, int) and value in AchivmentStatus.values:
+        return AchivmentStatus(value)
+    raise ValueError(f"Неизвестный status {value!r}, ожидается одно из: {', '.join(STATUS_NAMES)}")
+
+
+def parse_events(data):
+    events = data.get("events") if isinstance(data, dict) else data
+    if not isinstance(events, list):
+        raise ValueError("Ожидается список событий")
+
+    parsed = []
+    for index, event in enumerate(events):
+        try:
+            user, achivment, status = int(event["user"]), int(event["achivment"]), event["status"]
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"Событие {index}: нужны целые user, achivment и status")
+        try:
+            status = parse_status(status)
+        except ValueError as error:
+            raise ValueError(f"Событие {index}: {error}")
+        parsed.append((user, achivment, status))
+    return parsed
+
+
+def missing_references(pairs):
+    user_ids = {user for user, _ in pairs}
+    achivment_ids = {achivment for _, achivment in pairs}
+    return (
+        user_ids - set(User.objects.filter(pk__in=user_ids).values_list("pk", flat=True)),
+        achivment_ids - set(Achivments.objects.filter(pk__in=achivment_ids).values_list("pk", flat=True)),
+    )
+
+
+def current_statuses(pending):
+    rows = UserAchivment.objects.filter(
+        user_id__in={user for user, _ in pending},
+        achivment_id__in={achivment for _, achivment in pending},
+    ).values_list("user_id", "achivment_id", "status")
+    return {(user, achivment): status for user, achivment, status in rows if (user, achivment) in pending}
+
+
+def write_events(pending):
+    objects = [
+        UserAchivment(user_id_id=user, achivment_id_id=achivment, status=status)
+        for (user, achivment), status in pending.items()
+    ]
+    with transaction.atomic():
+        previous = current_statuses(pending)
+        UserAchivment.objects.bulk_create(
+            objects,
+            update_conflicts=True,
+            unique_fields=["user_id", "achivment_id"],
+            update_fields=["status"],
+        )
+        apply_changes([
+            ((*key, is_unlocked(previous[key])) if key in previous else None, (*key, is_unlocked(status)))
+            for key, status in pending.items()
+        ])
+
+
+class BufferFull(Exception):
+    pass
+
+
+class AchivmentEventBuffer:
+    def __init__(self, flush_size=1000, flush_interval=1.0, max_pending=100000):
+        if flush_size <= 0 or (flush_interval is not None and flush_interval <= 0):
+            raise ValueError("Размер и интервал сброса должны быть положительными")
+        if max_pending < flush_size:
+            raise ValueError("Предел буфера должен быть не меньше размера сброса")
+
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.pending = {}
+        self.flushed = 0
+        self._flushing = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="achivment-event-flusher", daemon=True)
+        self._thread.start()
+
+    def __len__(self):
+        return len(self.pending)
+
+    def add(self, events):
+        with self._lock:
+            added = {(user, achivment) for user, achivment, _ in events} - self.pending.keys()
+            if len(self.pending) + self._flushing + len(added) > self.max_pending:
+                logger.error(
+                    "Буфер событий достижений заполнен (%s из %s), отклонено %s событий",
+                    len(self.pending) + self._flushing, self.max_pending, len(events),
+                )
+                raise BufferFull("Буфер событий заполнен, повторите позже")
+            for user, achivment, status in events:
+                self.pending[user, achivment] = status
+            if len(self.pending) >= self.flush_size:
+                self._wake.set()
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                pending, self.pending = self.pending, {}
+                self._flushing = len(pending)
+            if not pending:
+                return 0
+
+            try:
+                try:
+                    write_events(pending)
+                except IntegrityError:
+                    users, achivments = missing_references(pending)
+                    pending = {
+                        key: status for key, status in pending.items()
+                        if key[0] not in users and key[1] not in achivments
+                    }
+                    logger.warning("Отброшены события удалённых пользователей %s и достижений %s", users, achivments)
+                    write_events(pending)
+            except Exception:
+                with self._lock:
+                    for key, status in pending.items():
+                        self.pending.setdefault(key, status)
+                    self._flushing = 0
+                raise
+
+            with self._lock:
+                self._flushing = 0
+
+            self.flushed += len(pending)
+            return len(pending)
+
+    def _run(self):
+        try:
+            while True:
+                self._wake.wait(self.flush_interval)
+                if self._stopped.is_set():
+                    break
+                self._wake.clear()
+                try:
+                    self.flush()
+                except Exception:
+                    logger.exception("Не удалось записать события достижений")
+        finally:
+            connection.close()
+
+    def close(self):
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer():
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None:
+            _buffer = AchivmentEventBuffer(
+                flush_size=getattr(settings, "ACHIVMENT_INGEST_FLUSH_SIZE", 1000),
+                flush_interval=getattr(settings, "ACHIVMENT_INGEST_FLUSH_INTERVAL", 1.0),
+                max_pending=getattr(settings, "ACHIVMENT_INGEST_MAX_PENDING", 100000),
+            )
+            atexit.register(_buffer.close)
+        return _buffer
@@ -0,0 +1,124 @@
+from collections import Counter
+from itertools import islice
+
+from django.db import connection, transaction
+from django.db.models import Count, Q
+
+from .cache import cached_result, completion_version_key, game_version_key, invalidate_completion
+from .models import AchivmentStatus, Achivments, LeaderboardEntry, Order, UserAchivment
+
+
+LEADERBOARD_SIZE = 100
+REBUILD_BATCH_SIZE = 5000
+
+UNLOCKED = Q(status=AchivmentStatus.UNLOCKED)
+
+
+def is_unlocked(status):
+    return status == AchivmentStatus.UNLOCKED
+
+
+TABLE = LeaderboardEntry._meta.db_table
+
+INCREMENT_GAME_SQL = (
+    f"INSERT INTO {TABLE} (user_id, game_id, unlocked) VALUES (%s, %s, %s) "
+    f"ON CONFLICT (user_id, game_id) DO UPDATE SET unlocked = {TABLE}.unlocked + excluded.unlocked"
+)
+INCREMENT_OVERALL_SQL = (
+    f"INSERT INTO {TABLE} (user_id, game_id, unlocked) VALUES (%s, NULL, %s) "
+    f"ON CONFLICT (user_id) WHERE game_id IS NULL DO UPDATE SET unlocked = {TABLE}.unlocked + excluded.unlocked"
+)
+DECREMENTED = "CASE WHEN unlocked > %s THEN unlocked - %s ELSE 0 END"
+DECREMENT_GAME_SQL = f"UPDATE {TABLE} SET unlocked = {DECREMENTED} WHERE user_id = %s AND game_id = %s"
+DECREMENT_OVERALL_SQL = f"UPDATE {TABLE} SET unlocked = {DECREMENTED} WHERE user_id = %s AND game_id IS NULL"
+PRUNE_GAME_SQL = f"DELETE FROM {TABLE} WHERE user_id = %s AND game_id = %s AND unlocked = 0"
+PRUNE_OVERALL_SQL = f"DELETE FROM {TABLE} WHERE user_id = %s AND game_id IS NULL AND unlocked = 0"
+
+
+def apply_deltas(deltas):
+    overall = Counter()
+    for (user_id, _), delta in deltas.items():
+        overall[user_id] += delta
+
+    statements = [
+        (INCREMENT_GAME_SQL, [(user, game, delta) for (user, game), delta in deltas.items() if delta > 0]),
+        (INCREMENT_OVERALL_SQL, [(user, delta) for user, delta in overall.items() if delta > 0]),
+        (DECREMENT_GAME_SQL, [(-delta, -delta, user, game) for (user, game), delta in deltas.items() if delta < 0]),
+        (DECREMENT_OVERALL_SQL, [(-delta, -delta, user) for user, delta in overall.items() if delta < 0]),
+        (PRUNE_GAME_SQL, [(user, game) for (user, game), delta in deltas.items() if delta < 0]),
+        (PRUNE_OVERALL_SQL, [(user,) for user, delta in overall.items() if delta < 0]),
+    ]
+    with transaction.atomic(), connection.cursor() as cursor:
+        for sql, params in statements:
+            if params:
+                cursor.executemany(sql, params)
+
+
+def achivment_games(achivment_ids):
+    return dict(Achivments.objects.filter(pk__in=set(achivment_ids)).values_list("pk", "game_name_id"))
+
+
+def apply_changes(changes):
+    states = [state for change in changes for state in change if state is not None and state[2]]
+    if not states:
+        return
+
+    games = achivment_games(achivment for _, achivment, _ in states)
+    invalidate_completion({games.get(achivment) for _, achivment, _ in states})
+    deltas = Counter()
+    for old, new in changes:
+        if old is not None and old[2] and old[1] in games:
+            deltas[old[0], games[old[1]]] -= 1
+        if new is not None and new[2] and new[1] in games:
+            deltas[new[0], games[new[1]]] += 1
+    apply_deltas(deltas)
+
+
+def _rebuilt_entries(batch_size):
+    unlocked = UserAchivment.objects.filter(UNLOCKED).order_by()
+    per_game = unlocked.values_list("user_id", "achivment_id__game_name").annotate(count=Count("pk"))
+    for user_id, game_id, count in per_game.iterator(chunk_size=batch_size):
+        yield LeaderboardEntry(user_id=user_id, game_id=game_id, unlocked=count)
+    overall = unlocked.values_list("user_id").annotate(count=Count("pk"))
+    for user_id, count in overall.iterator(chunk_size=batch_size):
+        yield LeaderboardEntry(user_id=user_id, game_id=None, unlocked=count)
+
+
+def rebuild_leaderboard(batch_size=REBUILD_BATCH_SIZE):
+    entries = _rebuilt_entries(batch_size)
+    total = 0
+    with transaction.atomic():
+        LeaderboardEntry.objects.all().delete()
+        while batch := list(islice(entries, batch_size)):
+            LeaderboardEntry.objects.bulk_create(batch)
+            total += len(batch)
+    return total
+
+
+def top_players(game_id=None, size=LEADERBOARD_SIZE):
+    return (
+        LeaderboardEntry.objects.filter(game_id=game_id, unlocked__gt=0)
+        .select_related("user")
+        .order_by("-unlocked", "user_id")[:size]
+    )
+
+
+def achivment_completion(game_id):
+    players = Order.objects.filter(game_id=game_id).values("user_id").distinct().count()
+    unlocked = dict(
+        UserAchivment.objects.filter(UNLOCKED, achivment_id__game_name=game_id)
+        .order_by().values_list("achivment_id").annotate(count=Count("pk"))
+    )
+    achivments = list(Achivments.objects.filter(game_name_id=game_id).order_by("pk"))
+    for achivment in achivments:
+        achivment.unlocked = unlocked.get(achivment.pk, 0)
+        achivment.completion = 100 * achivment.unlocked / players if players else 0
+    return players, achivments
+
+
+def cached_achivment_completion(game_id):
+    return cached_result(
+        f"completion:{game_id}",
+        [game_version_key(game_id), completion_version_key(game_id)],
+        lambda: achivment_completion(game_id),
+    )
@@ -0,0 +1,147 @@
+import asyncio
+import io
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+
+
+HOST = "localhost"
+
+
+def asgi_scope(path, query):
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", HOST.encode())],
+        "client": ("127.0.0.1", 0),
+        "server": (HOST, 80),
+    }
+
+
+def wsgi_environ(path, query):
+    return {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": query,
+        "SCRIPT_NAME": "",
+        "SERVER_NAME": HOST,
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": HOST,
+        "REMOTE_ADDR": "127.0.0.1",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+
+
+async def run_asgi(application, path, query, requests, concurrency, delay):
+    limit = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        status = None
+        sent = False
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await asyncio.Event().wait()
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                await asyncio.sleep(delay)
+
+        async with limit:
+            started = time.perf_counter()
+            await application(asgi_scope(path, query), receive, send)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(requests)))
+    return time.perf_counter() - started, latencies, errors
+
+
+def run_wsgi(application, path, query, requests, threads, delay):
+    def client(_):
+        status = []
+        started = time.perf_counter()
+        body = application(wsgi_environ(path, query), lambda value, headers: status.append(value))
+        try:
+            for _ in body:
+                time.sleep(delay)
+        finally:
+            getattr(body, "close", lambda: None)()
+        return time.perf_counter() - started, not status[0].startswith("200")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(client, range(requests)))
+    return time.perf_counter() - started, [latency for latency, _ in results], sum(error for _, error in results)
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает обработку одновременных медленных клиентов JSON API через ASGI и WSGI. "
+        "Медленный клиент читает каждый фрагмент ответа с задержкой --client-delay; "
+        "WSGI обслуживает клиентов пулом из --threads потоков, как воркер с потоками."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="/api/games/", help="адрес запроса")
+        parser.add_argument("--requests", type=int, default=500, help="число запросов")
+        parser.add_argument("--concurrency", type=int, default=200, help="одновременных клиентов ASGI")
+        parser.add_argument("--threads", type=int, default=8, help="потоков WSGI")
+        parser.add_argument("--client-delay", type=float, default=0.05, help="задержка клиента, с")
+
+    def handle(self, *args, **options):
+        if min(options["requests"], options["concurrency"], options["threads"]) <= 0:
+            raise CommandError("--requests, --concurrency и --threads должны быть положительными")
+        if options["client_delay"] < 0:
+            raise CommandError("--client-delay должен быть неотрицательным")
+
+        url = urlsplit(options["url"])
+        results = {
+            "ASGI": asyncio.run(run_asgi(
+                get_asgi_application(), url.path, url.query, options["requests"],
+                options["concurrency"], options["client_delay"],
+            )),
+            "WSGI": run_wsgi(
+                get_wsgi_application(), url.path, url.query, options["requests"],
+                options["threads"], options["client_delay"],
+            ),
+        }
+
+        self.stdout.write(f"{'':<6} {'запр/с':>10} {'p50, мс':>10} {'p99, мс':>10} {'ошибок':>8}")
+        for name, (elapsed, latencies, errors) in results.items():
+            percentiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+            self.stdout.write(
+                f"{name:<6} {len(latencies) / elapsed:>10.1f} {percentiles[49] * 1000:>10.1f} "
+                f"{percentiles[98] * 1000:>10.1f} {errors:>8}"
+            )
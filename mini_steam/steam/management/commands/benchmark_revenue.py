@@ -0,0 +1,91 @@
+import random
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+
+from steam.models import Game, Order
+from steam.revenue import apply_deltas, revenue_by_game
+
+
+INSERT_SQL = f"INSERT INTO {Order._meta.db_table} (game_id_id, user_id_id, price, created_at) VALUES (%s, %s, %s, %s)"
+
+
+def best_time(function, repeats):
+    best = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает время отчёта о выручке по сводной таблице и прямой агрегации по заказам "
+        "при росте числа заказов. Все данные создаются в транзакции и откатываются."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--max-orders", type=int, default=10 ** 7, help="максимальное число заказов")
+        parser.add_argument("--games", type=int, default=500, help="число игр")
+        parser.add_argument("--days", type=int, default=365, help="число дней продаж")
+        parser.add_argument("--repeats", type=int, default=5, help="повторов замера")
+        parser.add_argument("--batch-size", type=int, default=100000, help="заказов в одной вставке")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        if min(options["max_orders"], options["games"], options["days"], options["repeats"], options["batch_size"]) <= 0:
+            raise CommandError("Все параметры должны быть положительными")
+
+        with transaction.atomic():
+            self.run(options)
+            transaction.set_rollback(True)
+
+    def run(self, options):
+        generator = random.Random(options["seed"])
+        user = User.objects.create(username="benchmark_revenue")
+        games = [
+            game.pk for game in Game.objects.bulk_create(
+                Game(name=f"Бенчмарк {index}", price=100, description="") for index in range(options["games"])
+            )
+        ]
+        first_day = date.today() - timedelta(days=options["days"] - 1)
+        days = [first_day + timedelta(days=offset) for offset in range(options["days"])]
+
+        self.stdout.write(f"{'заказов':>12} {'сводка, мс':>12} {'агрегация, мс':>14}")
+        total = 0
+        size = 10 ** 4
+        while total < options["max_orders"]:
+            size = min(size, options["max_orders"])
+            while total < size:
+                count = min(options["batch_size"], size - total)
+                self.insert_orders(generator, games, days, user.pk, count)
+                total += count
+
+            rollup = best_time(lambda: list(revenue_by_game()), options["repeats"])
+            scan = best_time(
+                lambda: list(Order.objects.values("game_id").annotate(Count("pk"), Sum("price"))),
+                options["repeats"],
+            )
+            self.stdout.write(f"{total:>12} {rollup * 1000:>12.2f} {scan * 1000:>14.2f}")
+            size *= 10
+
+    def insert_orders(self, generator, games, days, user_id, count):
+        rows = []
+        deltas = defaultdict(lambda: [0, 0])
+        for _ in range(count):
+            game_id = generator.choice(games)
+            day = generator.choice(days)
+            price = generator.randint(1, 5000)
+            rows.append((game_id, user_id, price, f"{day.isoformat()} 12:00:00"))
+            deltas[game_id, day][0] += 1
+            deltas[game_id, day][1] += price
+        with connection.cursor() as cursor:
+            cursor.executemany(INSERT_SQL, rows)
+        apply_deltas(deltas)
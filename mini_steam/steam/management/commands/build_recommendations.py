@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from steam.cache import invalidate_all
+from steam.recommendations import (
+    MAX_PENDING_PAIRS,
+    ORDER_CHUNK_SIZE,
+    RECOMMENDATIONS_PER_GAME,
+    update_recommendations,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Строит рекомендации «с этой игрой покупают» по совместным покупкам. "
+        "По умолчанию обрабатывает только заказы после прошлого запуска; "
+        "--full пересчитывает всё, например после удаления или изменения заказов."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="пересчитать по всем заказам")
+        parser.add_argument("--top-k", type=int, default=RECOMMENDATIONS_PER_GAME, help="рекомендаций на игру")
+        parser.add_argument("--max-pairs", type=int, default=MAX_PENDING_PAIRS, help="пар игр в памяти до записи")
+        parser.add_argument("--chunk-size", type=int, default=ORDER_CHUNK_SIZE, help="заказов в одной выборке")
+
+    def handle(self, *args, **options):
+        if min(options["top_k"], options["max_pairs"], options["chunk_size"]) <= 0:
+            raise CommandError("--top-k, --max-pairs и --chunk-size должны быть положительными")
+
+        started = time.perf_counter()
+        counter = update_recommendations(
+            full=options["full"],
+            per_game=options["top_k"],
+            max_pending_pairs=options["max_pairs"],
+            chunk_size=options["chunk_size"],
+        )
+        invalidate_all()
+        self.stdout.write(self.style.SUCCESS(
+            f"Рекомендации обновлены: {counter.users} пользователей, {len(counter.touched)} игр "
+            f"за {time.perf_counter() - started:.1f} с"
+        ))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from steam.export import EXPORT_CHUNK_SIZE, EXPORTS, FORMATS, export_table
+
+
+class Command(BaseCommand):
+    help = "Потоковый экспорт заказов или достижений пользователей в CSV/NDJSON без загрузки таблицы в память."
+
+    def add_arguments(self, parser):
+        parser.add_argument("table", choices=sorted(EXPORTS), help="таблица для экспорта")
+        parser.add_argument("--format", choices=sorted(FORMATS), default="csv", help="формат вывода")
+        parser.add_argument("--output", help="файл для записи, по умолчанию stdout")
+        parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE, help="строк в одной выборке")
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] <= 0:
+            raise CommandError("--chunk-size должен быть положительным")
+
+        content, _ = export_table(options["table"], options["format"], options["chunk_size"])
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as file:
+                file.writelines(content)
+        else:
+            for chunk in content:
+                self.stdout.write(chunk, ending="")
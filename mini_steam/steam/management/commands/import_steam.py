@@ -0,0 +1,170 @@
+import csv
+import json
+import time
+from itertools import islice
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from steam.cache import invalidate_all
+from steam.ingest import parse_status
+from steam.leaderboard import rebuild_leaderboard
+from steam.revenue import rebuild_revenue
+from steam.models import Game, Achivments, UserAchivment, Order
+
+
+def read_rows(path):
+    with open(path, newline="", encoding="utf-8") as file:
+        if path.endswith((".jsonl", ".ndjson")):
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(file)
+
+
+def parse_created_at(value):
+    created_at = parse_datetime(value)
+    if created_at is None:
+        raise ValueError(f"Некорректная дата заказа {value!r}")
+    if timezone.is_naive(created_at):
+        created_at = timezone.make_aware(created_at)
+    return created_at
+
+
+def batched(rows, size):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Потоковый импорт игр, достижений, достижений пользователей и заказов из CSV/JSONL. "
+        "Колонки: games - id, name, price, description; achivments - id, game, name, description; "
+        "user_achivments - user, achivment, status (locked, in_progress, unlocked или 0-2); orders - game, user, price, created_at (необязательно, ISO 8601, иначе текущее время). "
+        "game и achivment - id из импортируемых файлов или первичный ключ в базе, user - имя пользователя."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--games", help="файл с играми")
+        parser.add_argument("--achivments", help="файл с достижениями")
+        parser.add_argument("--user-achivments", help="файл с достижениями пользователей")
+        parser.add_argument("--orders", help="файл с заказами")
+        parser.add_argument("--batch-size", type=int, default=1000, help="строк в одной транзакции")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] <= 0:
+            raise CommandError("--batch-size должен быть положительным")
+
+        self.batch_size = options["batch_size"]
+        self.verbosity = options["verbosity"]
+        self.game_ids = {}
+        self.achivment_ids = {}
+        self.user_ids = None
+
+        if options["games"]:
+            self.import_file(options["games"], Game, self.build_game)
+        if options["achivments"]:
+            self.import_file(options["achivments"], Achivments, self.build_achivment)
+        if options["user_achivments"]:
+            self.import_file(options["user_achivments"], UserAchivment, self.build_user_achivment)
+            rebuild_leaderboard()
+        if options["orders"]:
+            self.import_file(options["orders"], Order, self.build_order)
+            rebuild_revenue()
+        invalidate_all()
+
+    def resolve(self, id_map, model, value):
+        if value in id_map:
+            return id_map[value]
+        try:
+            pk = int(value)
+        except (TypeError, ValueError):
+            pk = None
+        if pk is None or not model.objects.filter(pk=pk).exists():
+            raise CommandError(f"{model.__name__} с id {value!r} не найден")
+        id_map[value] = pk
+        return pk
+
+    def resolve_user(self, username):
+        if self.user_ids is None:
+            self.user_ids = dict(User.objects.values_list("username", "pk").iterator())
+        try:
+            return self.user_ids[username]
+        except KeyError:
+            raise CommandError(f"Пользователь {username!r} не найден") from None
+
+    def build_game(self, row):
+        return Game(name=row["name"], price=int(row["price"]), description=row.get("description") or "")
+
+    def build_achivment(self, row):
+        return Achivments(
+            game_name_id=self.resolve(self.game_ids, Game, str(row["game"])),
+            name_achivments=row["name"],
+            description=row.get("description") or "",
+        )
+
+    def build_user_achivment(self, row):
+        return UserAchivment(
+            user_id_id=self.resolve_user(row["user"]),
+            achivment_id_id=self.resolve(self.achivment_ids, Achivments, str(row["achivment"])),
+            status=parse_status(row["status"]),
+        )
+
+    def build_order(self, row):
+        order = Order(
+            game_id_id=self.resolve(self.game_ids, Game, str(row["game"])),
+            user_id_id=self.resolve_user(row["user"]),
+            price=int(row["price"]),
+        )
+        if row.get("created_at") not in (None, ""):
+            order.created_at = parse_created_at(row["created_at"])
+        return order
+
+    def insert(self, model, objects):
+        if model is UserAchivment:
+            return model.objects.bulk_create(
+                objects,
+                update_conflicts=True,
+                unique_fields=["user_id", "achivment_id"],
+                update_fields=["status"],
+            )
+        return model.objects.bulk_create(objects)
+
+    def import_file(self, path, model, build):
+        id_map = {Game: self.game_ids, Achivments: self.achivment_ids}.get(model)
+        started = time.perf_counter()
+        total = 0
+        for batch in batched(read_rows(path), self.batch_size):
+            try:
+                objects = [build(row) for row in batch]
+            except (KeyError, TypeError, ValueError) as error:
+                raise CommandError(f"{path}: некорректная строка после {total} импортированных: {error}")
+
+            try:
+                with transaction.atomic():
+                    created = self.insert(model, objects)
+            except DatabaseError as error:
+                raise CommandError(f"{path}: не удалось сохранить строки после {total} импортированных: {error}")
+            if id_map is not None:
+                for row, obj in zip(batch, created):
+                    if row.get("id") not in (None, ""):
+                        id_map[str(row["id"])] = obj.pk
+
+            total += len(batch)
+            if self.verbosity >= 2:
+                self.stdout.write(f"{model.__name__}: {total} строк, {self.rate(total, started):,.0f} строк/с")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{model.__name__}: импортировано {total} строк за {time.perf_counter() - started:.2f} с "
+            f"({self.rate(total, started):,.0f} строк/с)"
+        ))
+
+    @staticmethod
+    def rate(total, started):
+        elapsed = time.perf_counter() - started
+        return total / elapsed if elapsed > 0 else 0.0
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from steam.leaderboard import REBUILD_BATCH_SIZE, rebuild_leaderboard
+
+
+class Command(BaseCommand):
+    help = "Полностью пересчитывает таблицу лидеров по открытым достижениям пользователей."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=REBUILD_BATCH_SIZE, help="строк в одной вставке")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] <= 0:
+            raise CommandError("--batch-size должен быть положительным")
+
+        started = time.perf_counter()
+        total = rebuild_leaderboard(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Таблица лидеров пересчитана: {total} строк за {time.perf_counter() - started:.1f} с"
+        ))
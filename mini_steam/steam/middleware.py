@@ -0,0 +1,124 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+
+logger = logging.getLogger("steam.sql")
+
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+IN_LIST_RE = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)")
+
+
+def normalize_sql(sql):
+    sql = STRING_RE.sub("?", sql)
+    sql = NUMBER_RE.sub("?", sql)
+    sql = IN_LIST_RE.sub("(...)", sql.replace("%s", "?"))
+    return " ".join(sql.split())
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - started))
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def total_time(self):
+        return sum(duration for _, duration in self.queries)
+
+    @property
+    def slowest(self):
+        return max(self.queries, key=lambda query: query[1], default=None)
+
+    @property
+    def most_repeated(self):
+        repeats = Counter(normalize_sql(sql) for sql, _ in self.queries).most_common(1)
+        return repeats[0] if repeats else None
+
+
+current_recorder = ContextVar("sql_recorder", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    recorder = current_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    return recorder(execute, sql, params, many, context)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class SQLInstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        recorder = QueryRecorder()
+        token = current_recorder.set(recorder)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_recorder.reset(token)
+        return self.process_response(request, response, recorder)
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        token = current_recorder.set(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_recorder.reset(token)
+        return self.process_response(request, response, recorder)
+
+    def process_response(self, request, response, recorder):
+        response.sql_recorder = recorder
+        response["Server-Timing"] = self.server_timing(recorder)
+
+        repeated = recorder.most_repeated
+        if repeated and repeated[1] > getattr(settings, "SQL_INSTRUMENTATION_REPEAT_LIMIT", 5):
+            response["X-SQL-Repeated-Query"] = str(repeated[1])
+            logger.warning(
+                "Возможная проблема N+1: %s %s выполнил %d раз запрос %s",
+                request.method, request.path, repeated[1], repeated[0],
+            )
+        if getattr(settings, "SQL_INSTRUMENTATION_LOG", False):
+            slowest = recorder.slowest
+            logger.info(
+                "%s %s: %d запросов, %.1f мс в БД, самый медленный %.1f мс: %s",
+                request.method, request.path, recorder.count, recorder.total_time * 1000,
+                slowest[1] * 1000 if slowest else 0, slowest[0] if slowest else "",
+            )
+        return response
+
+    def server_timing(self, recorder):
+        metrics = [f'db;dur={recorder.total_time * 1000:.2f};desc="{recorder.count} queries"']
+        slowest = recorder.slowest
+        if slowest:
+            metrics.append(f"db-slowest;dur={slowest[1] * 1000:.2f}")
+        return ", ".join(metrics)
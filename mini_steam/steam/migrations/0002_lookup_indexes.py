@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:43
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def remove_duplicate_user_achivments(apps, schema_editor):
+    UserAchivment = apps.get_model('steam', 'UserAchivment')
+    first_ids = UserAchivment.objects.values('user_id', 'achivment_id').annotate(first_id=Min('id')).values('first_id')
+    UserAchivment.objects.exclude(id__in=first_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('steam', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['name'], name='steam_game_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['user_id', 'game_id'], name='steam_order_user_game_idx'),
+        ),
+        migrations.RunPython(remove_duplicate_user_achivments, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='userachivment',
+            constraint=models.UniqueConstraint(fields=('user_id', 'achivment_id'), name='steam_userachivment_user_achivment_uniq'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('steam', '0002_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='achivments',
+            index=models.Index(fields=['name_achivments'], name='steam_achivments_name_idx'),
+        ),
+    ]
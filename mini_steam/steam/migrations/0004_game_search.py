@@ -0,0 +1,58 @@
+from django.db import migrations
+
+
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE steam_game_fts USING fts5(
+        name, description,
+        content='steam_game', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER steam_game_fts_insert AFTER INSERT ON steam_game BEGIN
+        INSERT INTO steam_game_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER steam_game_fts_delete AFTER DELETE ON steam_game BEGIN
+        INSERT INTO steam_game_fts(steam_game_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER steam_game_fts_update AFTER UPDATE OF name, description ON steam_game BEGIN
+        INSERT INTO steam_game_fts(steam_game_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO steam_game_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END
+    """,
+    "INSERT INTO steam_game_fts(steam_game_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS steam_game_fts_update",
+    "DROP TRIGGER IF EXISTS steam_game_fts_delete",
+    "DROP TRIGGER IF EXISTS steam_game_fts_insert",
+    "DROP TABLE IF EXISTS steam_game_fts",
+]
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != "sqlite":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('steam', '0003_autocomplete_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(run(CREATE_SQL), run(DROP_SQL)),
+    ]
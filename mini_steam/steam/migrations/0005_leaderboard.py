@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_leaderboard(apps, schema_editor):
+    UserAchivment = apps.get_model('steam', 'UserAchivment')
+    LeaderboardEntry = apps.get_model('steam', 'LeaderboardEntry')
+    unlocked = UserAchivment.objects.filter(status__in=('done', 'True')).order_by()
+    LeaderboardEntry.objects.bulk_create(
+        LeaderboardEntry(user_id=user_id, game_id=game_id, unlocked=count)
+        for user_id, game_id, count in unlocked.values_list('user_id', 'achivment_id__game_name').annotate(Count('pk'))
+    )
+    LeaderboardEntry.objects.bulk_create(
+        LeaderboardEntry(user_id=user_id, game_id=None, unlocked=count)
+        for user_id, count in unlocked.values_list('user_id').annotate(Count('pk'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('steam', '0004_game_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unlocked', models.PositiveIntegerField(default=0)),
+                ('game', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='steam.game')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['game', '-unlocked', 'user'], name='steam_leaderboard_top_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'game'), name='steam_leaderboard_user_game_uniq'), models.UniqueConstraint(condition=models.Q(('game__isnull', True)), fields=('user',), name='steam_leaderboard_user_overall_uniq')],
+            },
+        ),
+        migrations.RunPython(fill_leaderboard, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:03
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def fill_revenue_rollup(apps, schema_editor):
+    Order = apps.get_model('steam', 'Order')
+    RevenueRollup = apps.get_model('steam', 'RevenueRollup')
+    rows = Order.objects.order_by().values_list('game_id', TruncDate('created_at')).annotate(Count('pk'), Sum('price'))
+    RevenueRollup.objects.bulk_create(
+        RevenueRollup(game_id=game_id, day=day, orders=orders, revenue=revenue)
+        for game_id, day, orders, revenue in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('steam', '0005_leaderboard'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.CreateModel(
+            name='RevenueRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('orders', models.PositiveIntegerField(default=0)),
+                ('revenue', models.PositiveBigIntegerField(default=0)),
+                ('game', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='revenue_rollups', to='steam.game')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['game', 'day', 'orders', 'revenue'], name='steam_revenuerollup_game_idx'), models.Index(fields=['day', 'game', 'orders', 'revenue'], name='steam_revenuerollup_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('game', 'day'), name='steam_revenuerollup_game_day_uniq')],
+            },
+        ),
+        migrations.RunPython(fill_revenue_rollup, migrations.RunPython.noop),
+    ]
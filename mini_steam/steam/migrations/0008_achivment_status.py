@@ -0,0 +1,86 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:24
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+from steam.ingest import parse_status
+
+
+def encode_statuses(apps, schema_editor):
+    UserAchivment = apps.get_model('steam', 'UserAchivment')
+    LeaderboardEntry = apps.get_model('steam', 'LeaderboardEntry')
+    codes = {}
+    for status in UserAchivment.objects.order_by().values_list('status', flat=True).distinct():
+        try:
+            code = parse_status(status)
+        except ValueError:
+            continue
+        codes.setdefault(code, []).append(status)
+    for code, statuses in codes.items():
+        UserAchivment.objects.filter(status__in=statuses).update(status_code=code)
+
+    LeaderboardEntry.objects.all().delete()
+    unlocked = UserAchivment.objects.filter(status_code=2).order_by()
+    LeaderboardEntry.objects.bulk_create(
+        LeaderboardEntry(user_id=user_id, game_id=game_id, unlocked=count)
+        for user_id, game_id, count in unlocked.values_list('user_id', 'achivment_id__game_name').annotate(Count('pk'))
+    )
+    LeaderboardEntry.objects.bulk_create(
+        LeaderboardEntry(user_id=user_id, game_id=None, unlocked=count)
+        for user_id, count in unlocked.values_list('user_id').annotate(Count('pk'))
+    )
+
+
+def decode_statuses(apps, schema_editor):
+    UserAchivment = apps.get_model('steam', 'UserAchivment')
+    UserAchivment.objects.filter(status_code=2).update(status='done')
+    UserAchivment.objects.exclude(status_code=2).update(status='new')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('steam', '0007_recommendations'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userachivment',
+            name='status_code',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='userachivment',
+            name='status',
+            field=models.CharField(default='new', max_length=5),
+        ),
+        migrations.RunPython(encode_statuses, decode_statuses),
+        migrations.RemoveField(
+            model_name='userachivment',
+            name='status',
+        ),
+        migrations.RenameField(
+            model_name='userachivment',
+            old_name='status_code',
+            new_name='status',
+        ),
+        migrations.AlterField(
+            model_name='userachivment',
+            name='status',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'Закрыто'), (1, 'В процессе'), (2, 'Открыто')], default=0),
+        ),
+        migrations.AddIndex(
+            model_name='userachivment',
+            index=models.Index(condition=models.Q(('status', 2)), fields=['user_id', 'achivment_id'], name='steam_ua_user_unlocked_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userachivment',
+            index=models.Index(condition=models.Q(('status', 2)), fields=['achivment_id'], name='steam_ua_achiv_unlocked_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='userachivment',
+            constraint=models.CheckConstraint(condition=models.Q(('status__in', [0, 1, 2])), name='steam_userachivment_status_valid'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:51
+
+import steam.models
+from django.db import migrations, models
+
+
+BATCH_SIZE = 2000
+
+PREFIX_KEYS = [
+    ('Game', 'name', 'name_key'),
+    ('Achivments', 'name_achivments', 'name_achivments_key'),
+]
+
+CREATE_USERNAME_INDEX_SQL = 'CREATE INDEX steam_user_username_nocase_idx ON auth_user (username COLLATE NOCASE)'
+DROP_USERNAME_INDEX_SQL = 'DROP INDEX IF EXISTS steam_user_username_nocase_idx'
+
+
+def fill_prefix_keys(apps, schema_editor):
+    for model_name, source, key in PREFIX_KEYS:
+        model = apps.get_model('steam', model_name)
+        batch = []
+        for instance in model.objects.only(source).order_by('pk').iterator(chunk_size=BATCH_SIZE):
+            setattr(instance, key, steam.models.prefix_key(getattr(instance, source)))
+            batch.append(instance)
+            if len(batch) == BATCH_SIZE:
+                model.objects.bulk_update(batch, [key])
+                batch = []
+        model.objects.bulk_update(batch, [key])
+
+
+def run(statement):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('steam', '0008_achivment_status'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='achivments',
+            name='name_achivments_key',
+            field=steam.models.PrefixKeyField(editable=False, max_length=100, null=True, source='name_achivments'),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='name_key',
+            field=steam.models.PrefixKeyField(editable=False, max_length=100, null=True, source='name'),
+        ),
+        migrations.RunPython(fill_prefix_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='achivments',
+            index=models.Index(fields=['name_achivments_key'], name='steam_achivments_name_key_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['name_key'], name='steam_game_name_key_idx'),
+        ),
+        migrations.RunPython(run(CREATE_USERNAME_INDEX_SQL), run(DROP_USERNAME_INDEX_SQL)),
+    ]
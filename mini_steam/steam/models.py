@@ -1,23 +1,160 @@
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
+
+def prefix_key(value):
+    return value.lower() if value is not None else None
+
+
+class PrefixKeyField(models.CharField):
+    def __init__(self, *args, source=None, **kwargs):
+        self.source = source
+        kwargs.setdefault("editable", False)
+        # Nullable so SQLite adds the column in place instead of rebuilding
+        # the table, which would drop the steam_game full-text triggers.
+        kwargs.setdefault("null", True)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs["source"] = self.source
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = prefix_key(getattr(model_instance, self.source))
+        setattr(model_instance, self.attname, value)
+        return value
 
 # Create your models here.
 class Game(models.Model):
     name = models.CharField(max_length=100)
+    name_key = PrefixKeyField(max_length=100, source="name")
     price = models.PositiveIntegerField()
     description = models.CharField(max_length=10000)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["name"], name="steam_game_name_idx"),
+            models.Index(fields=["name_key"], name="steam_game_name_key_idx"),
+        ]
+
+    def __str__(self):
+        return self.name
+
 class Achivments(models.Model):
     game_name = models.ForeignKey(Game, on_delete=models.CASCADE, related_name="achivments")
     name_achivments = models.CharField(max_length=100)
+    name_achivments_key = PrefixKeyField(max_length=100, source="name_achivments")
     description = models.CharField(max_length=100)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["name_achivments"], name="steam_achivments_name_idx"),
+            models.Index(fields=["name_achivments_key"], name="steam_achivments_name_key_idx"),
+        ]
+
+    def __str__(self):
+        return self.name_achivments
+
+class AchivmentStatus(models.IntegerChoices):
+    LOCKED = 0, "Закрыто"
+    IN_PROGRESS = 1, "В процессе"
+    UNLOCKED = 2, "Открыто"
+
 class UserAchivment(models.Model):
     user_id = models.ForeignKey(User, on_delete=models.CASCADE, related_name="userAchivments")
     achivment_id = models.ForeignKey(Achivments, on_delete=models.CASCADE, related_name="userAchivments")
-    status = models.CharField(max_length=5)
+    status = models.PositiveSmallIntegerField(choices=AchivmentStatus.choices, default=AchivmentStatus.LOCKED)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user_id", "achivment_id"], name="steam_userachivment_user_achivment_uniq"),
+            models.CheckConstraint(
+                condition=models.Q(status__in=AchivmentStatus.values), name="steam_userachivment_status_valid"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["user_id", "achivment_id"],
+                condition=models.Q(status=AchivmentStatus.UNLOCKED),
+                name="steam_ua_user_unlocked_idx",
+            ),
+            models.Index(
+                fields=["achivment_id"],
+                condition=models.Q(status=AchivmentStatus.UNLOCKED),
+                name="steam_ua_achiv_unlocked_idx",
+            ),
+        ]
 
 class Order(models.Model):
     game_id = models.ForeignKey(Game, on_delete=models.CASCADE, related_name="orders")
     user_id = models.ForeignKey(User, on_delete=models.CASCADE, related_name="orders")
     price = models.PositiveIntegerField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user_id", "game_id"], name="steam_order_user_game_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(*args, **kwargs)
+
+class LeaderboardEntry(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="leaderboard_entries")
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, null=True, related_name="leaderboard_entries")
+    unlocked = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["game", "-unlocked", "user"], name="steam_leaderboard_top_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "game"], name="steam_leaderboard_user_game_uniq"),
+            models.UniqueConstraint(
+                fields=["user"], condition=models.Q(game__isnull=True), name="steam_leaderboard_user_overall_uniq"
+            ),
+        ]
+
+class RevenueRollup(models.Model):
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, db_index=False, related_name="revenue_rollups")
+    day = models.DateField()
+    orders = models.PositiveIntegerField(default=0)
+    revenue = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["game", "day"], name="steam_revenuerollup_game_day_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["game", "day", "orders", "revenue"], name="steam_revenuerollup_game_idx"),
+            models.Index(fields=["day", "game", "orders", "revenue"], name="steam_revenuerollup_day_idx"),
+        ]
+
+class GameCooccurrence(models.Model):
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, db_index=False, related_name="+")
+    other = models.ForeignKey(Game, on_delete=models.CASCADE, related_name="+")
+    buyers = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["game", "other"], name="steam_gamecooccurrence_game_other_uniq"),
+        ]
+
+class GameRecommendation(models.Model):
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, db_index=False, related_name="recommendations")
+    recommended = models.ForeignKey(Game, on_delete=models.CASCADE, related_name="+")
+    buyers = models.PositiveIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["game", "-buyers", "recommended"], name="steam_recommendation_top_idx"),
+        ]
+
+class RecommendationState(models.Model):
+    last_order_id = models.BigIntegerField(default=0)
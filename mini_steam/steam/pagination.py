@@ -0,0 +1,99 @@
+from collections import namedtuple
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max
+from django.http import Http404
+from django.utils.functional import cached_property
+
+
+PAGE_SIZE = 20
+ESTIMATED_COUNT_THRESHOLD = 10000
+
+KeysetPage = namedtuple("KeysetPage", ["object_list", "next_after", "previous_before"])
+
+
+def _cursor(value):
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise Http404("Некорректный курсор страницы")
+
+
+def _limit(value, default):
+    if value is None or value == "":
+        return default
+    try:
+        limit = int(value)
+    except ValueError:
+        limit = 0
+    if limit <= 0:
+        raise ValueError("Параметр limit должен быть положительным целым числом")
+    return limit
+
+
+def keyset_paginate(request, queryset, page_size=PAGE_SIZE):
+    after = _cursor(request.GET.get("after"))
+    before = _cursor(request.GET.get("before"))
+
+    if before is not None:
+        objects = list(queryset.filter(pk__lt=before).order_by("-pk")[:page_size + 1])
+        has_previous = len(objects) > page_size
+        objects = objects[:page_size][::-1]
+        has_next = True
+    else:
+        if after is not None:
+            queryset = queryset.filter(pk__gt=after)
+        objects = list(queryset.order_by("pk")[:page_size + 1])
+        has_next = len(objects) > page_size
+        objects = objects[:page_size]
+        has_previous = after is not None
+
+    return KeysetPage(
+        object_list=objects,
+        next_after=objects[-1].pk if objects and has_next else None,
+        previous_before=objects[0].pk if objects and has_previous else None,
+    )
+
+
+async def akeyset_paginate_values(request, queryset, fields, expressions=None, page_size=PAGE_SIZE,
+                                  max_page_size=None):
+    after = _cursor(request.GET.get("after"))
+    limit = _limit(request.GET.get("limit"), page_size)
+    limit = min(limit, max_page_size or page_size)
+
+    if after is not None:
+        queryset = queryset.filter(pk__gt=after)
+    queryset = queryset.order_by("pk").values("id", *fields, **(expressions or {}))
+    rows = [row async for row in queryset[:limit + 1]]
+    return {
+        "results": rows[:limit],
+        "next_after": rows[limit - 1]["id"] if len(rows) > limit else None,
+    }
+
+
+def estimate_count(queryset):
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        return row[0] if row and row[0] >= 0 else None
+    if connection.vendor == "sqlite":
+        return queryset.model._default_manager.using(queryset.db).aggregate(estimate=Max("pk"))["estimate"] or 0
+    return None
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if getattr(queryset, "query", None) is not None and not queryset.query.where:
+            estimate = estimate_count(queryset)
+            if estimate is not None and estimate >= ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
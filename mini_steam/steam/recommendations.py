@@ -0,0 +1,111 @@
+from collections import Counter
+from itertools import combinations, groupby
+
+from django.db import connection, transaction
+from django.db.models import Max
+
+from .models import GameCooccurrence, GameRecommendation, Order, RecommendationState
+
+
+RECOMMENDATIONS_PER_GAME = 10
+MAX_PENDING_PAIRS = 1000000
+ORDER_CHUNK_SIZE = 10000
+REFRESH_BATCH_SIZE = 500
+
+COOCCURRENCE_TABLE = GameCooccurrence._meta.db_table
+RECOMMENDATION_TABLE = GameRecommendation._meta.db_table
+
+INCREMENT_SQL = (
+    f"INSERT INTO {COOCCURRENCE_TABLE} (game_id, other_id, buyers) VALUES (%s, %s, %s) "
+    f"ON CONFLICT (game_id, other_id) DO UPDATE SET buyers = {COOCCURRENCE_TABLE}.buyers + excluded.buyers"
+)
+TOP_K_SQL = (
+    f"INSERT INTO {RECOMMENDATION_TABLE} (game_id, recommended_id, buyers) "
+    f"SELECT game_id, other_id, buyers FROM ("
+    f"SELECT game_id, other_id, buyers, "
+    f"ROW_NUMBER() OVER (PARTITION BY game_id ORDER BY buyers DESC, other_id) AS position "
+    f"FROM {COOCCURRENCE_TABLE} {{where}}"
+    f") ranked WHERE position <= %s"
+)
+
+
+class CooccurrenceCounter:
+    def __init__(self, max_pending_pairs=MAX_PENDING_PAIRS):
+        self.max_pending_pairs = max_pending_pairs
+        self.pending = Counter()
+        self.touched = set()
+        self.users = 0
+
+    def add_user(self, old_games, new_games):
+        if not new_games:
+            return
+        for game in new_games:
+            for other in old_games:
+                self.pending[game, other] += 1
+                self.pending[other, game] += 1
+        for game, other in combinations(new_games, 2):
+            self.pending[game, other] += 1
+            self.pending[other, game] += 1
+        self.touched.update(new_games)
+        self.touched.update(old_games)
+        self.users += 1
+        if len(self.pending) >= self.max_pending_pairs:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            rows = [(game, other, count) for (game, other), count in self.pending.items()]
+            with connection.cursor() as cursor:
+                cursor.executemany(INCREMENT_SQL, rows)
+            self.pending.clear()
+
+
+def refresh_recommendations(game_ids=None, per_game=RECOMMENDATIONS_PER_GAME):
+    with transaction.atomic(), connection.cursor() as cursor:
+        if game_ids is None:
+            GameRecommendation.objects.all().delete()
+            cursor.execute(TOP_K_SQL.format(where=""), [per_game])
+            return
+
+        game_ids = sorted(game_ids)
+        for start in range(0, len(game_ids), REFRESH_BATCH_SIZE):
+            batch = game_ids[start:start + REFRESH_BATCH_SIZE]
+            GameRecommendation.objects.filter(game_id__in=batch).delete()
+            placeholders = ", ".join(["%s"] * len(batch))
+            cursor.execute(TOP_K_SQL.format(where=f"WHERE game_id IN ({placeholders})"), [*batch, per_game])
+
+
+def _count_orders(counter, orders, last_order_id):
+    for _, rows in groupby(orders, key=lambda row: row[0]):
+        old_games = set()
+        new_games = set()
+        for _, game_id, order_id in rows:
+            (old_games if order_id <= last_order_id else new_games).add(game_id)
+        counter.add_user(sorted(old_games), sorted(new_games - old_games))
+    counter.flush()
+
+
+def update_recommendations(full=False, per_game=RECOMMENDATIONS_PER_GAME,
+                           max_pending_pairs=MAX_PENDING_PAIRS, chunk_size=ORDER_CHUNK_SIZE):
+    with transaction.atomic():
+        state, _ = RecommendationState.objects.select_for_update().get_or_create(pk=1)
+        last_order_id = 0 if full else state.last_order_id
+        newest_order_id = Order.objects.aggregate(newest=Max("pk"))["newest"] or 0
+        counter = CooccurrenceCounter(max_pending_pairs)
+        if newest_order_id == last_order_id and not full:
+            return counter
+
+        orders = Order.objects.filter(pk__gt=last_order_id, pk__lte=newest_order_id)
+        if full:
+            GameCooccurrence.objects.all().delete()
+        else:
+            users = orders.values("user_id")
+            orders = Order.objects.filter(user_id__in=users, pk__lte=newest_order_id)
+        orders = orders.order_by("user_id").values_list("user_id", "game_id", "pk").iterator(chunk_size=chunk_size)
+
+        _count_orders(counter, orders, last_order_id)
+        refresh_recommendations(None if full else counter.touched, per_game)
+
+        state.last_order_id = newest_order_id
+        state.save()
+    return counter
@@ -0,0 +1,110 @@
+from collections import defaultdict
+from itertools import islice
+
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Game, Order, RevenueRollup
+
+
+REBUILD_BATCH_SIZE = 5000
+
+TABLE = RevenueRollup._meta.db_table
+
+INCREMENT_SQL = (
+    f"INSERT INTO {TABLE} (game_id, day, orders, revenue) VALUES (%s, %s, %s, %s) "
+    f"ON CONFLICT (game_id, day) DO UPDATE SET "
+    f"orders = {TABLE}.orders + excluded.orders, revenue = {TABLE}.revenue + excluded.revenue"
+)
+UPDATE_SQL = f"UPDATE {TABLE} SET orders = orders + %s, revenue = revenue + %s WHERE game_id = %s AND day = %s"
+PRUNE_SQL = f"DELETE FROM {TABLE} WHERE game_id = %s AND day = %s AND orders <= 0"
+
+
+def order_day(created_at):
+    if timezone.is_naive(created_at):
+        created_at = timezone.make_aware(created_at)
+    return timezone.localdate(created_at)
+
+
+def revenue_state(order):
+    return (order.game_id_id, order_day(order.created_at), order.price)
+
+
+def apply_deltas(deltas):
+    increments = []
+    updates = []
+    for (game_id, day), (orders, revenue) in deltas.items():
+        if orders > 0:
+            increments.append((game_id, day.isoformat(), orders, revenue))
+        elif orders or revenue:
+            updates.append((orders, revenue, game_id, day.isoformat()))
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        if updates:
+            cursor.executemany(UPDATE_SQL, updates)
+            cursor.executemany(PRUNE_SQL, [(game_id, day) for _, _, game_id, day in updates])
+        if increments:
+            cursor.executemany(INCREMENT_SQL, increments)
+
+
+def apply_changes(changes):
+    deltas = defaultdict(lambda: [0, 0])
+    for old, new in changes:
+        if old is not None:
+            game_id, day, price = old
+            deltas[game_id, day][0] -= 1
+            deltas[game_id, day][1] -= price
+        if new is not None:
+            game_id, day, price = new
+            deltas[game_id, day][0] += 1
+            deltas[game_id, day][1] += price
+    apply_deltas(deltas)
+
+
+def _rebuilt_rollups(batch_size):
+    rows = (
+        Order.objects.order_by()
+        .values_list("game_id", TruncDate("created_at"))
+        .annotate(Count("pk"), Sum("price"))
+    )
+    for game_id, day, orders, revenue in rows.iterator(chunk_size=batch_size):
+        yield RevenueRollup(game_id=game_id, day=day, orders=orders, revenue=revenue)
+
+
+def rebuild_revenue(batch_size=REBUILD_BATCH_SIZE):
+    rollups = _rebuilt_rollups(batch_size)
+    total = 0
+    with transaction.atomic():
+        RevenueRollup.objects.all().delete()
+        while batch := list(islice(rollups, batch_size)):
+            RevenueRollup.objects.bulk_create(batch)
+            total += len(batch)
+    return total
+
+
+def _in_range(rollups, start, end):
+    if start:
+        rollups = rollups.filter(day__gte=start)
+    if end:
+        rollups = rollups.filter(day__lte=end)
+    return rollups
+
+
+def revenue_by_game(start=None, end=None):
+    rows = list(
+        _in_range(RevenueRollup.objects.all(), start, end)
+        .values("game_id")
+        .annotate(orders_count=Sum("orders"), revenue_total=Sum("revenue"))
+        .order_by("-revenue_total", "game_id")
+    )
+    names = dict(Game.objects.filter(pk__in=[row["game_id"] for row in rows]).values_list("pk", "name"))
+    for row in rows:
+        row["game_name"] = names.get(row["game_id"])
+    return rows
+
+
+def revenue_by_day(game_id, start=None, end=None):
+    rollups = _in_range(RevenueRollup.objects.filter(game_id=game_id), start, end)
+    return rollups.order_by("-day").values("day", "orders", "revenue")
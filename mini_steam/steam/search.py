@@ -0,0 +1,85 @@
+import re
+from collections import namedtuple
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.http import Http404
+
+from .models import Game, prefix_key
+from .pagination import PAGE_SIZE
+
+
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+SearchPage = namedtuple("SearchPage", ["object_list", "query", "number", "has_next"])
+
+
+def _page_number(value):
+    if value is None or value == "":
+        return 1
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise Http404("Некорректный номер страницы")
+    return number
+
+
+def match_expression(query):
+    return " ".join(f'"{term}"*' for term in re.findall(r"\w+", query))
+
+
+def prefix_filter(queryset, field, prefix):
+    key = f"{field}_key"
+    if any(model_field.name == key for model_field in queryset.model._meta.concrete_fields):
+        prefix = prefix_key(prefix)
+        return queryset.filter(**{f"{key}__gte": prefix, f"{key}__lt": prefix + "\U0010ffff"})
+    return queryset.filter(**{f"{field}__istartswith": prefix})
+
+
+def filter_games(queryset, query):
+    expression = match_expression(query)
+    if not expression:
+        return queryset.none()
+    if connection.vendor != "sqlite":
+        return prefix_filter(queryset, "name", query)
+    return queryset.filter(pk__in=RawSQL(
+        "SELECT rowid FROM steam_game_fts WHERE steam_game_fts MATCH %s", [expression]
+    ))
+
+
+def _ranked_ids(query, limit, offset):
+    expression = match_expression(query)
+    if not expression:
+        return []
+
+    if connection.vendor != "sqlite":
+        condition = Q()
+        for term in re.findall(r"\w+", query):
+            condition &= Q(name__icontains=term) | Q(description__icontains=term)
+        return list(Game.objects.filter(condition).order_by("pk").values_list("pk", flat=True)[offset:offset + limit])
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT rowid FROM steam_game_fts WHERE steam_game_fts MATCH %s "
+            "ORDER BY bm25(steam_game_fts, %s, %s), rowid LIMIT %s OFFSET %s",
+            [expression, NAME_WEIGHT, DESCRIPTION_WEIGHT, limit, offset],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search_games(request, page_size=PAGE_SIZE):
+    query = request.GET.get("q", "").strip()
+    number = _page_number(request.GET.get("page"))
+
+    ids = _ranked_ids(query, page_size + 1, (number - 1) * page_size)
+    games = Game.objects.in_bulk(ids[:page_size])
+    return SearchPage(
+        object_list=[games[pk] for pk in ids[:page_size] if pk in games],
+        query=query,
+        number=number,
+        has_next=len(ids) > page_size,
+    )
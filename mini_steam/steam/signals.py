@@ -0,0 +1,117 @@
+from collections import Counter
+
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .cache import invalidate_catalog, invalidate_game
+from .models import Game, Achivments, UserAchivment, Order
+from . import leaderboard, revenue
+
+
+@receiver(post_save, sender=Game)
+@receiver(post_delete, sender=Game)
+def invalidate_game_pages(sender, instance, **kwargs):
+    invalidate_catalog()
+    invalidate_game(instance.pk)
+
+
+UNKNOWN = object()
+
+
+def leaderboard_state(instance):
+    if instance.pk is None:
+        return None
+    return (instance.user_id_id, instance.achivment_id_id, leaderboard.is_unlocked(instance.status))
+
+
+def revenue_state(instance):
+    return revenue.revenue_state(instance) if instance.pk is not None else None
+
+
+SNAPSHOTS = {
+    Achivments: [("_cached_game_id", {"game_name_id"}, lambda instance: instance.game_name_id)],
+    Order: [
+        ("_cached_game_id", {"game_id_id"}, lambda instance: instance.game_id_id),
+        ("_revenue_state", {"game_id_id", "created_at", "price"}, revenue_state),
+    ],
+    UserAchivment: [("_leaderboard_state", {"user_id_id", "achivment_id_id", "status"}, leaderboard_state)],
+}
+
+
+def remember_state(sender, instance, **kwargs):
+    deferred = instance.get_deferred_fields() if instance.pk is not None else set()
+    for attr, fields, state in SNAPSHOTS[sender]:
+        setattr(instance, attr, UNKNOWN if deferred & fields else state(instance))
+
+
+def load_unknown_state(sender, instance, **kwargs):
+    snapshots = [snapshot for snapshot in SNAPSHOTS[sender] if getattr(instance, snapshot[0]) is UNKNOWN]
+    if not snapshots:
+        return
+    stored = sender._base_manager.filter(pk=instance.pk).first()
+    for attr, _, state in snapshots:
+        setattr(instance, attr, state(stored) if stored is not None else None)
+
+
+for model in SNAPSHOTS:
+    post_init.connect(remember_state, sender=model)
+    pre_save.connect(load_unknown_state, sender=model)
+    pre_delete.connect(load_unknown_state, sender=model)
+
+
+@receiver(post_save, sender=Achivments)
+def move_achivment_leaderboard(sender, instance, created, **kwargs):
+    if created or instance._cached_game_id == instance.game_name_id:
+        return
+    deltas = Counter()
+    unlocked = instance.userAchivments.filter(leaderboard.UNLOCKED)
+    for user_id in unlocked.values_list("user_id", flat=True).iterator():
+        deltas[user_id, instance._cached_game_id] -= 1
+        deltas[user_id, instance.game_name_id] += 1
+    leaderboard.apply_deltas(deltas)
+
+
+@receiver(post_save, sender=Achivments)
+@receiver(post_delete, sender=Achivments)
+def invalidate_achivment_game(sender, instance, **kwargs):
+    invalidate_game(instance.game_name_id)
+    if instance._cached_game_id != instance.game_name_id:
+        invalidate_game(instance._cached_game_id)
+    instance._cached_game_id = instance.game_name_id
+
+
+@receiver(post_save, sender=Order)
+def update_revenue_on_save(sender, instance, **kwargs):
+    state = revenue_state(instance)
+    if state != instance._revenue_state:
+        revenue.apply_changes([(instance._revenue_state, state)])
+    instance._revenue_state = state
+
+
+@receiver(post_delete, sender=Order)
+def update_revenue_on_delete(sender, instance, **kwargs):
+    revenue.apply_changes([(instance._revenue_state, None)])
+    instance._revenue_state = None
+
+
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+def invalidate_order_game(sender, instance, **kwargs):
+    invalidate_game(instance.game_id_id)
+    if instance._cached_game_id != instance.game_id_id:
+        invalidate_game(instance._cached_game_id)
+    instance._cached_game_id = instance.game_id_id
+
+
+@receiver(post_save, sender=UserAchivment)
+def update_leaderboard_on_save(sender, instance, **kwargs):
+    state = leaderboard_state(instance)
+    if state != instance._leaderboard_state:
+        leaderboard.apply_changes([(instance._leaderboard_state, state)])
+    instance._leaderboard_state = state
+
+
+@receiver(post_delete, sender=UserAchivment)
+def update_leaderboard_on_delete(sender, instance, **kwargs):
+    leaderboard.apply_changes([(instance._leaderboard_state, None)])
+    instance._leaderboard_state = None
@@ -0,0 +1,32 @@
+document.addEventListener("DOMContentLoaded", function () {
+    document.querySelectorAll("select[data-autocomplete-url]").forEach(function (select) {
+        var search = document.createElement("input");
+        var timer = null;
+        search.type = "search";
+        search.placeholder = "Поиск...";
+        search.className = select.className;
+        select.parentNode.insertBefore(search, select);
+
+        search.addEventListener("input", function () {
+            clearTimeout(timer);
+            timer = setTimeout(function () {
+                var url = select.dataset.autocompleteUrl + "?q=" + encodeURIComponent(search.value);
+                fetch(url, {credentials: "same-origin"})
+                    .then(function (response) { return response.json(); })
+                    .then(function (data) {
+                        var selected = select.value;
+                        Array.from(select.options).forEach(function (option) {
+                            if (option.value && option.value !== selected) {
+                                option.remove();
+                            }
+                        });
+                        data.results.forEach(function (item) {
+                            if (String(item.id) !== selected) {
+                                select.add(new Option(item.text, item.id));
+                            }
+                        });
+                    });
+            }, 250);
+        });
+    });
+});
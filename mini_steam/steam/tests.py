@@ -1,3 +1,1209 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timezone as dt_timezone
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import IntegrityError, OperationalError
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models import Count
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .models import AchivmentStatus, Game, Achivments, UserAchivment, Order, LeaderboardEntry, RevenueRollup, GameRecommendation
+from . import api, views
+from .cache import cache_stats
+from .export import render_ndjson
+from .middleware import QueryRecorder, normalize_sql
+from . import ingest, pagination
+from .pagination import PAGE_SIZE, EstimatedCountPaginator
+from .search import match_expression, prefix_filter
+from .leaderboard import achivment_completion, rebuild_leaderboard, top_players
+from .revenue import rebuild_revenue
+from .recommendations import update_recommendations
 
 # Create your tests here.
+
+def create_catalog(games=3, achivments_per_game=2, users=2):
+    game_objects = Game.objects.bulk_create(
+        Game(name=f"Игра {index}", price=100 + index, description=f"Описание {index}")
+        for index in range(games)
+    )
+    achivment_objects = Achivments.objects.bulk_create(
+        Achivments(game_name=game, name_achivments=f"{game.name}: достижение {index}", description="")
+        for game in game_objects
+        for index in range(achivments_per_game)
+    )
+    user_objects = User.objects.bulk_create(User(username=f"user{index}") for index in range(users))
+    return game_objects, achivment_objects, user_objects
+
+
+class QueryBudgetMixin:
+    def assertQueryBudget(self, url, budget, data=None):
+        response = self.client.get(url, data)
+        self.assertLess(response.status_code, 400, url)
+        recorder = response.sql_recorder
+        self.assertLessEqual(
+            recorder.count, budget,
+            f"{url}: {recorder.count} запросов при бюджете {budget}:\n" + "\n".join(sql for sql, _ in recorder.queries),
+        )
+        self.assertNotIn("X-SQL-Repeated-Query", response, url)
+        return response
+
+
+class ListingViewsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.games, cls.achivments, cls.users = create_catalog(games=PAGE_SIZE * 2 + 5)
+        UserAchivment.objects.bulk_create(
+            UserAchivment(user_id=user, achivment_id=achivment, status=AchivmentStatus.UNLOCKED)
+            for user in cls.users
+            for achivment in cls.achivments
+        )
+        Order.objects.bulk_create(
+            Order(game_id=game, user_id=user, price=game.price)
+            for user in cls.users
+            for game in cls.games
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.users[0])
+
+    def walk_pages(self, url_name):
+        pks = []
+        url = reverse(url_name)
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            page = response.context["page"]
+            pks.extend(item.pk for item in page.object_list)
+            url = f"{reverse(url_name)}?after={page.next_after}" if page.next_after else None
+        return pks
+
+    def test_keyset_pages_cover_every_row_once(self):
+        self.assertEqual(self.walk_pages("game_list"), list(Game.objects.order_by("pk").values_list("pk", flat=True)))
+        self.assertEqual(len(self.walk_pages("achivment_list")), Achivments.objects.count())
+        self.assertEqual(len(self.walk_pages("user_achivment_list")), UserAchivment.objects.count())
+        self.assertEqual(len(self.walk_pages("order_list")), Order.objects.count())
+
+    def test_previous_page(self):
+        first = self.client.get(reverse("game_list")).context["page"]
+        second = self.client.get(reverse("game_list"), {"after": first.next_after}).context["page"]
+        back = self.client.get(reverse("game_list"), {"before": second.previous_before}).context["page"]
+        self.assertEqual([game.pk for game in back.object_list], [game.pk for game in first.object_list])
+        self.assertIsNone(back.previous_before)
+
+    def test_page_cost_does_not_depend_on_depth(self):
+        last = Order.objects.order_by("-pk").values_list("pk", flat=True)[PAGE_SIZE + 1]
+        for url_name, session_queries in [
+            ("game_list", 0), ("achivment_list", 0), ("user_achivment_list", 2), ("order_list", 2)
+        ]:
+            with self.subTest(url_name=url_name):
+                with self.assertNumQueries(1 + session_queries):
+                    self.client.get(reverse(url_name))
+                with self.assertNumQueries(1 + session_queries):
+                    self.client.get(reverse(url_name), {"after": last})
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse("game_list"), {"after": "abc"})
+        self.assertEqual(response.status_code, 404)
+
+
+class LookupIndexesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.games, cls.achivments, cls.users = create_catalog()
+
+    def assertUsesIndex(self, queryset, expected):
+        plan = queryset.explain()
+        self.assertNotIn("SCAN", plan)
+        self.assertIn("USING", plan)
+        self.assertIn(expected, plan)
+
+    def test_order_lookup_by_user_and_game(self):
+        queryset = Order.objects.filter(user_id=self.users[0], game_id=self.games[0])
+        self.assertUsesIndex(queryset, "steam_order_user_game_idx")
+
+    def test_user_achivment_lookup_by_user(self):
+        self.assertUsesIndex(UserAchivment.objects.filter(user_id=self.users[0]), "user_id_id=?")
+        queryset = UserAchivment.objects.filter(user_id=self.users[0], achivment_id=self.achivments[0])
+        self.assertUsesIndex(queryset, "user_id_id=? AND achivment_id_id=?")
+
+    def test_game_lookup_by_name(self):
+        self.assertUsesIndex(Game.objects.filter(name="Игра 1"), "steam_game_name_idx")
+
+    def test_user_achivment_is_unique(self):
+        UserAchivment.objects.create(user_id=self.users[0], achivment_id=self.achivments[0], status=AchivmentStatus.UNLOCKED)
+        with self.assertRaises(IntegrityError):
+            UserAchivment.objects.create(user_id=self.users[0], achivment_id=self.achivments[0], status=AchivmentStatus.UNLOCKED)
+
+
+class AutocompleteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.games, cls.achivments, cls.users = create_catalog(games=30, users=30)
+
+    def setUp(self):
+        self.client.force_login(self.users[0])
+
+    def test_prefix_search_is_limited_and_sorted(self):
+        response = self.client.get(reverse("autocomplete_games"), {"q": "Игра 1"})
+        names = [item["text"] for item in response.json()["results"]]
+        self.assertEqual(names, sorted(name for name in (game.name for game in self.games) if name.startswith("Игра 1")))
+
+        response = self.client.get(reverse("autocomplete_users"))
+        self.assertEqual(len(response.json()["results"]), views.AUTOCOMPLETE_LIMIT)
+
+    def test_prefix_search_ignores_case(self):
+        for prefix in ["игра 1", "ИГРА 1", "Игра 1", "иГрА 1"]:
+            response = self.client.get(reverse("autocomplete_games"), {"q": prefix})
+            self.assertIn("Игра 1", [item["text"] for item in response.json()["results"]])
+
+        game = Game.objects.create(name="McDonald Tycoon", price=1, description="")
+        Achivments.objects.create(game_name=game, name_achivments="McD: первая смена", description="")
+        User.objects.create(username="McDuck")
+        for url_name, text in [
+            ("autocomplete_games", "McDonald Tycoon"),
+            ("autocomplete_achivments", "McD: первая смена"),
+            ("autocomplete_users", "McDuck"),
+        ]:
+            for prefix in ["mcd", "MCD", "McD", "mCd"]:
+                with self.subTest(url_name=url_name, prefix=prefix):
+                    response = self.client.get(reverse(url_name), {"q": prefix})
+                    self.assertEqual([item["text"] for item in response.json()["results"]], [text])
+
+        game.name = "Drive-In Tycoon"
+        game.save()
+        response = self.client.get(reverse("autocomplete_games"), {"q": "drive"})
+        self.assertEqual([item["text"] for item in response.json()["results"]], ["Drive-In Tycoon"])
+
+    def test_autocomplete_requires_login(self):
+        self.client.logout()
+        for url_name in ["autocomplete_games", "autocomplete_achivments", "autocomplete_users"]:
+            with self.subTest(url_name=url_name):
+                self.assertEqual(self.client.get(reverse(url_name)).status_code, 302)
+
+    def test_results_use_id_and_label(self):
+        achivment = self.achivments[0]
+        response = self.client.get(reverse("autocomplete_achivments"), {"q": achivment.name_achivments})
+        self.assertEqual(response.json()["results"], [{"id": achivment.pk, "text": str(achivment)}])
+
+    def test_prefix_search_uses_index(self):
+        for queryset, field in [
+            (Game.objects.all(), "name"),
+            (Achivments.objects.all(), "name_achivments"),
+            (User.objects.all(), "username"),
+        ]:
+            with self.subTest(field=field):
+                plan = prefix_filter(queryset, field, "a").order_by(field).explain()
+                self.assertNotIn("SCAN", plan)
+
+    def test_form_pages_do_not_render_whole_tables(self):
+        for url_name in ["user_achivment_create", "order_create", "achivment_create"]:
+            with self.subTest(url_name=url_name):
+                with self.assertNumQueries(2):
+                    response = self.client.get(reverse(url_name))
+                self.assertNotContains(response, self.games[-1].name)
+                self.assertNotContains(response, self.users[-1].username)
+                self.assertContains(response, "data-autocomplete-url")
+
+    def test_update_page_renders_selected_values(self):
+        order = Order.objects.create(game_id=self.games[-1], user_id=self.users[-1], price=1)
+        response = self.client.get(reverse("order_update", args=[order.pk]))
+        self.assertContains(response, f'<option value="{self.games[-1].pk}" selected>{self.games[-1].name}</option>', html=True)
+        self.assertContains(response, f'<option value="{self.users[-1].pk}" selected>{self.users[-1].username}</option>', html=True)
+        self.assertNotContains(response, self.games[-2].name)
+
+    def test_form_accepts_any_existing_choice(self):
+        response = self.client.post(reverse("order_create"), {
+            "game_id": self.games[-1].pk, "user_id": self.users[-1].pk, "price": 10,
+        })
+        self.assertRedirects(response, reverse("games_page"))
+        self.assertTrue(Order.objects.filter(game_id=self.games[-1], user_id=self.users[-1]).exists())
+
+
+class ImportCommandTests(TestCase):
+    def write(self, name, text):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+        return path
+
+    def test_import_resolves_references_between_files(self):
+        User.objects.create(username="alice")
+        existing = Game.objects.create(name="Старая игра", price=1, description="")
+        games = self.write("games.csv", "id,name,price,description\ng1,Игра 1,100,Первая\ng2,Игра 2,200,Вторая\n")
+        achivments = self.write("achivments.jsonl", (
+            '{"id": 10, "game": "g1", "name": "Начало"}\n'
+            f'{{"id": 11, "game": "{existing.pk}", "name": "Ветеран"}}\n'
+        ))
+        user_achivments = self.write("user_achivments.csv", "user,achivment,status\nalice,10,new\nalice,11,in_progress\nalice,10,2\n")
+        orders = self.write("orders.csv", "game,user,price,created_at\ng1,alice,100,2026-01-05T10:00:00\ng2,alice,200,\n")
+
+        out = io.StringIO()
+        call_command(
+            "import_steam", games=games, achivments=achivments, user_achivments=user_achivments,
+            orders=orders, batch_size=1, stdout=out,
+        )
+
+        self.assertEqual(Game.objects.count(), 3)
+        self.assertEqual(Achivments.objects.get(name_achivments="Начало").game_name.name, "Игра 1")
+        self.assertEqual(Achivments.objects.get(name_achivments="Ветеран").game_name, existing)
+        self.assertEqual(
+            sorted(UserAchivment.objects.values_list("achivment_id__name_achivments", "status")),
+            [("Ветеран", AchivmentStatus.IN_PROGRESS), ("Начало", AchivmentStatus.UNLOCKED)],
+        )
+        self.assertEqual(sorted(Order.objects.values_list("game_id__name", "price")), [("Игра 1", 100), ("Игра 2", 200)])
+        self.assertEqual(
+            Order.objects.get(price=100).created_at, datetime(2026, 1, 5, 10, tzinfo=dt_timezone.utc)
+        )
+        self.assertEqual(Order.objects.get(price=200).created_at.date(), date.today())
+        self.assertIn("Order: импортировано 2 строк", out.getvalue())
+
+    def test_unknown_reference_fails(self):
+        orders = self.write("orders.csv", "game,user,price\nmissing,alice,100\n")
+        with self.assertRaisesMessage(CommandError, "Game с id 'missing' не найден"):
+            call_command("import_steam", orders=orders, stdout=io.StringIO())
+
+        User.objects.create(username="alice")
+        game = Game.objects.create(name="Игра", price=1, description="")
+        orders = self.write("orders.csv", f"game,user,price,created_at\n{game.pk},alice,100,вчера\n")
+        with self.assertRaisesMessage(CommandError, "Некорректная дата заказа"):
+            call_command("import_steam", orders=orders, stdout=io.StringIO())
+
+    def test_missing_descriptions_and_database_errors(self):
+        games = self.write("games.jsonl", '{"name": "Игра", "price": 1, "description": null}\n')
+        call_command("import_steam", games=games, stdout=io.StringIO())
+        game = Game.objects.get()
+        self.assertEqual(game.description, "")
+        achivments = self.write("achivments.csv", f"game,name,description\n{game.pk},Первое\n")
+        call_command("import_steam", achivments=achivments, stdout=io.StringIO())
+        self.assertEqual(Achivments.objects.get().description, "")
+
+        games = self.write("games.jsonl", '{"name": null, "price": 1}\n')
+        with self.assertRaisesMessage(CommandError, "не удалось сохранить строки после 0 импортированных"):
+            call_command("import_steam", games=games, stdout=io.StringIO())
+        games = self.write("games.jsonl", '{"name": "Игра", "price": null}\n')
+        with self.assertRaisesMessage(CommandError, "некорректная строка после 0 импортированных"):
+            call_command("import_steam", games=games, stdout=io.StringIO())
+        self.assertEqual(Game.objects.count(), 1)
+
+
+
+class CachedPagesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.games, cls.achivments, cls.users = create_catalog(games=2)
+
+    def setUp(self):
+        cache.clear()
+
+    def get_detail(self, game):
+        return self.client.get(reverse("game_detail", args=[game.pk]))
+
+    def test_repeated_reads_are_served_from_cache(self):
+        self.get_detail(self.games[0])
+        self.client.get(reverse("game_list"))
+        with self.assertNumQueries(0):
+            response = self.get_detail(self.games[0])
+            self.client.get(reverse("game_list"))
+        self.assertContains(response, self.achivments[0].name_achivments)
+        stats = cache_stats()
+        self.assertEqual(stats["game_detail"], {"hits": 1, "misses": 1, "hit_rate": 0.5})
+        self.assertEqual(stats["game_list"]["hits"], 1)
+
+    def test_unknown_query_parameters_share_the_cache_entry(self):
+        cache.clear()
+        self.client.get(reverse("game_list"), {"utm": "1"})
+        self.get_detail(self.games[0])
+        with self.assertNumQueries(0):
+            self.client.get(reverse("game_list"), {"utm": "2"})
+            self.client.get(reverse("game_detail", args=[self.games[0].pk]), {"x": "y"})
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("game_list"), {"after": self.games[0].pk})
+        self.assertNotContains(response, self.games[0].name)
+        self.assertEqual(cache_stats()["game_list"]["misses"], 2)
+
+    def test_game_update_invalidates_only_that_game(self):
+        self.get_detail(self.games[0])
+        self.get_detail(self.games[1])
+        game = Game.objects.get(pk=self.games[0].pk)
+        game.name = "Новое название"
+        game.save()
+
+        self.assertContains(self.get_detail(self.games[0]), "Новое название")
+        self.assertContains(self.client.get(reverse("game_list")), "Новое название")
+        with self.assertNumQueries(0):
+            self.get_detail(self.games[1])
+
+    def test_achivment_and_order_changes_invalidate_game(self):
+        self.get_detail(self.games[0])
+        self.get_detail(self.games[1])
+        achivment = Achivments.objects.get(pk=self.achivments[0].pk)
+        achivment.game_name = self.games[1]
+        achivment.save()
+        self.assertNotContains(self.get_detail(self.games[0]), achivment.name_achivments)
+        self.assertContains(self.get_detail(self.games[1]), achivment.name_achivments)
+
+        order = Order.objects.create(game_id=self.games[1], user_id=self.users[0], price=1)
+        self.assertContains(self.get_detail(self.games[1]), "Продано копий: 1")
+        order.delete()
+        self.assertContains(self.get_detail(self.games[1]), "Продано копий: 0")
+
+    def test_cache_statistics_requires_staff(self):
+        self.assertEqual(self.client.get(reverse("cache_statistics")).status_code, 302)
+        staff = User.objects.create(username="admin", is_staff=True)
+        self.client.force_login(staff)
+        self.assertIn("game_list", self.client.get(reverse("cache_statistics")).json())
+
+
+class ApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.games, cls.achivments, cls.users = create_catalog(games=api.API_PAGE_SIZE + 5)
+        cls.user_achivment = UserAchivment.objects.create(
+            user_id=cls.users[0], achivment_id=cls.achivments[0], status=AchivmentStatus.UNLOCKED
+        )
+        Order.objects.create(game_id=cls.games[0], user_id=cls.users[0], price=100)
+
+    async def test_games_are_paginated_by_cursor(self):
+        first = (await self.async_client.get(reverse("api_games"))).json()
+        self.assertEqual(len(first["results"]), api.API_PAGE_SIZE)
+        self.assertEqual(first["results"][0], {"id": self.games[0].pk, "name": "Игра 0", "price": 100})
+
+        second = (await self.async_client.get(reverse("api_games"), {"after": first["next_after"]})).json()
+        self.assertEqual(len(second["results"]), 5)
+        self.assertIsNone(second["next_after"])
+
+        response = await self.async_client.get(reverse("api_games"), {"limit": 10 ** 6})
+        self.assertEqual(len(response.json()["results"]), len(self.games))
+
+        for limit in ("abc", "0", "-5"):
+            response = await self.async_client.get(reverse("api_games"), {"limit": limit})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("limit", response.json()["detail"])
+
+    async def test_game_detail_with_achivments(self):
+        data = (await self.async_client.get(reverse("api_game", args=[self.games[1].pk]))).json()
+        self.assertEqual(data["description"], "Описание 1")
+        self.assertEqual([item["id"] for item in data["achivments"]], [self.achivments[2].pk, self.achivments[3].pk])
+
+        response = await self.async_client.get(reverse("api_game", args=[0]))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_achivments_filtered_by_game(self):
+        response = await self.async_client.get(reverse("api_achivments"), {"game": self.games[2].pk})
+        self.assertEqual([item["game"] for item in response.json()["results"]], [self.games[2].pk] * 2)
+
+    async def test_user_achivments(self):
+        url = reverse("api_user_achivments", args=[self.users[0].pk])
+        self.assertEqual((await self.async_client.get(url)).status_code, 401)
+        await self.async_client.aforce_login(self.users[1])
+        self.assertEqual((await self.async_client.get(url)).status_code, 403)
+
+        await self.async_client.aforce_login(self.users[0])
+        response = await self.async_client.get(url)
+        self.assertEqual(response.json()["results"], [{
+            "id": self.user_achivment.pk,
+            "achivment": self.achivments[0].pk,
+            "achivment_name": self.achivments[0].name_achivments,
+            "game": self.games[0].pk,
+            "status": "unlocked",
+        }])
+
+    async def test_user_orders_are_private(self):
+        url = reverse("api_user_orders", args=[self.users[0].pk])
+        self.assertEqual((await self.async_client.get(url)).status_code, 401)
+
+        await self.async_client.aforce_login(self.users[1])
+        self.assertEqual((await self.async_client.get(url)).status_code, 403)
+
+        await self.async_client.aforce_login(self.users[0])
+        results = (await self.async_client.get(url)).json()["results"]
+        self.assertEqual([(item["game_name"], item["price"]) for item in results], [("Игра 0", 100)])
+
+    async def test_api_is_read_only(self):
+        response = await self.async_client.post(reverse("api_games"))
+        self.assertEqual(response.status_code, 405)
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.games, cls.achivments, cls.users = create_catalog(games=3, users=3)
+        Order.objects.bulk_create(
+            Order(game_id=game, user_id=user, price=game.price, created_at=datetime(2026, 1, day, 12, tzinfo=dt_timezone.utc))
+            for day, user in enumerate(cls.users, start=1)
+            for game in cls.games
+        )
+        UserAchivment.objects.bulk_create(
+            UserAchivment(user_id=user, achivment_id=cls.achivments[0], status=AchivmentStatus.UNLOCKED)
+            for user in cls.users
+        )
+        cls.staff = User.objects.create(username="analyst", is_staff=True)
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+
+    def test_csv_export_streams_every_row(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("export", args=["orders", "csv"]))
+            self.assertTrue(response.streaming)
+            content = b"".join(response.streaming_content).decode()
+
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(len(rows), Order.objects.count())
+        first = Order.objects.order_by("pk").first()
+        self.assertEqual(rows[0], {
+            "id": str(first.pk), "game": str(first.game_id.pk), "game_name": first.game_id.name,
+            "user": first.user_id.username, "price": str(first.price), "created_at": str(first.created_at),
+        })
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="orders.csv"')
+
+    def test_ndjson_export(self):
+        response = self.client.get(reverse("export", args=["user_achivments", "ndjson"]))
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([row["user"] for row in rows], [user.username for user in self.users])
+        self.assertEqual({row["achivment_name"] for row in rows}, {self.achivments[0].name_achivments})
+        self.assertEqual({row["status"] for row in rows}, {"unlocked"})
+
+    def test_ndjson_sends_first_row_immediately(self):
+        chunks = list(render_ndjson(["id"], iter([(1,), (2,), (3,), (4,)]), chunk_size=2))
+        self.assertEqual(chunks, ['{"id": 1}\n', '{"id": 2}\n{"id": 3}\n', '{"id": 4}\n'])
+
+    def test_export_requires_staff_and_known_table(self):
+        self.assertEqual(self.client.get(reverse("export", args=["auth_user", "csv"])).status_code, 404)
+        self.assertEqual(self.client.get(reverse("export", args=["orders", "xml"])).status_code, 404)
+        self.client.force_login(self.users[0])
+        self.assertEqual(self.client.get(reverse("export", args=["orders", "csv"])).status_code, 302)
+
+    def test_command_output_can_be_imported_back(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "orders.csv")
+        call_command("export_steam", "orders", output=path, chunk_size=2)
+
+        created = sorted(Order.objects.values_list("created_at", flat=True))
+        Order.objects.all().delete()
+        call_command("import_steam", orders=path, stdout=io.StringIO())
+        self.assertEqual(sorted(Order.objects.values_list("created_at", flat=True)), created)
+        self.assertEqual(
+            sorted(RevenueRollup.objects.values_list("game_id", "day", "orders")),
+            [(game.pk, date(2026, 1, day), 1) for game in self.games for day in range(1, len(self.users) + 1)],
+        )
+
+        out = io.StringIO()
+        call_command("export_steam", "orders", format="ndjson", stdout=out)
+        self.assertEqual(json.loads(out.getvalue().splitlines()[0])["created_at"], "2026-01-01 12:00:00+00:00")
+
+        out = io.StringIO()
+        call_command("export_steam", "user_achivments", format="ndjson", stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), len(self.users))
+
+
+class GameSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.games, cls.achivments, cls.users = create_catalog(games=PAGE_SIZE + 5)
+        cls.dragon = Game.objects.create(name="Драконы", price=1, description="Стратегия")
+        cls.mention = Game.objects.create(name="Рыцари", price=1, description="Бои с драконами и рыцарями")
+
+    def search(self, query, **params):
+        response = self.client.get(reverse("game_search"), {"q": query, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.context["page"]
+
+    def test_name_matches_rank_above_description(self):
+        self.assertEqual(self.search("драконы").object_list, [self.dragon])
+        self.assertEqual(self.search("драк").object_list, [self.dragon, self.mention])
+
+    def test_pages_are_ranked_and_complete(self):
+        first = self.search("описание")
+        second = self.search("описание", page=2)
+        self.assertTrue(first.has_next)
+        self.assertFalse(second.has_next)
+        self.assertEqual(
+            sorted(game.pk for game in first.object_list + second.object_list),
+            sorted(game.pk for game in self.games),
+        )
+
+    def test_index_follows_game_changes(self):
+        game = Game.objects.get(pk=self.mention.pk)
+        game.name = "Гоблины"
+        game.description = "Без драконов"
+        game.save()
+        self.assertEqual(self.search("гобл").object_list, [game])
+        self.assertEqual(self.search("рыцар").object_list, [])
+
+        game.delete()
+        self.assertEqual(self.search("гобл").object_list, [])
+
+    def test_query_syntax_is_escaped(self):
+        self.assertEqual(match_expression('a" OR name:b*'), '"a"* "OR"* "name"* "b"*')
+        self.assertEqual(self.search('"драконы" -(').object_list, [self.dragon])
+        self.assertEqual(self.search("").object_list, [])
+        self.assertEqual(self.client.get(reverse("game_search"), {"q": "a", "page": "0"}).status_code, 404)
+
+
+class AdminTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.games, cls.achivments, cls.users = create_catalog(games=5, users=5)
+        cls.admin = User.objects.create_superuser("root", "root@example.com", "password")
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def changelist_queries(self, model, **params):
+        url = reverse(f"admin:steam_{model}_changelist")
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return len(context), response
+
+    def test_changelists_do_not_query_per_row(self):
+        Order.objects.bulk_create(Order(game_id=self.games[0], user_id=user, price=1) for user in self.users)
+        UserAchivment.objects.bulk_create(
+            UserAchivment(user_id=user, achivment_id=self.achivments[0], status=AchivmentStatus.UNLOCKED) for user in self.users
+        )
+        for model in ["game", "achivments", "userachivment", "order"]:
+            with self.subTest(model=model):
+                few, _ = self.changelist_queries(model)
+                create_extra = {
+                    "game": lambda: Game.objects.create(name="Ещё", price=1, description=""),
+                    "achivments": lambda: Achivments.objects.create(
+                        game_name=self.games[1], name_achivments="Ещё", description=""
+                    ),
+                    "userachivment": lambda: UserAchivment.objects.create(
+                        user_id=self.admin, achivment_id=self.achivments[1], status=AchivmentStatus.UNLOCKED
+                    ),
+                    "order": lambda: Order.objects.create(game_id=self.games[1], user_id=self.admin, price=1),
+                }[model]
+                create_extra()
+                self.assertEqual(self.changelist_queries(model)[0], few)
+
+    def test_search_uses_prefix_and_full_text_index(self):
+        _, response = self.changelist_queries("achivments", q=self.achivments[3].name_achivments)
+        self.assertEqual(list(response.context["cl"].result_list), [self.achivments[3]])
+        _, response = self.changelist_queries("game", q="описан 2")
+        self.assertEqual(list(response.context["cl"].result_list), [self.games[2]])
+        order = Order.objects.create(game_id=self.games[0], user_id=self.users[1], price=1)
+        Order.objects.create(game_id=self.games[0], user_id=self.users[2], price=1)
+        _, response = self.changelist_queries("order", q="user1")
+        self.assertEqual(list(response.context["cl"].result_list), [order])
+
+    def test_change_forms_do_not_load_dropdowns(self):
+        order = Order.objects.create(game_id=self.games[0], user_id=self.users[0], price=1)
+        response = self.client.get(reverse("admin:steam_order_change", args=[order.pk]))
+        self.assertNotContains(response, self.games[-1].name)
+        self.assertNotContains(response, self.users[-1].username)
+
+    def test_estimated_count_skips_count_for_large_unfiltered_tables(self):
+        original = pagination.ESTIMATED_COUNT_THRESHOLD
+        pagination.ESTIMATED_COUNT_THRESHOLD = 1
+        self.addCleanup(setattr, pagination, "ESTIMATED_COUNT_THRESHOLD", original)
+        Game.objects.filter(pk=self.games[0].pk).delete()
+
+        with CaptureQueriesContext(connection) as context:
+            count = EstimatedCountPaginator(Game.objects.order_by("pk"), 2).count
+        self.assertEqual(count, self.games[-1].pk)
+        self.assertNotIn("COUNT(", context[0]["sql"].upper())
+        self.assertEqual(EstimatedCountPaginator(Game.objects.filter(price__gt=0).order_by("pk"), 2).count, 4)
+
+
+class SQLInstrumentationTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.games, cls.achivments, cls.users = create_catalog(games=PAGE_SIZE + 5, users=3)
+        cls.user_achivment = UserAchivment.objects.create(
+            user_id=cls.users[0], achivment_id=cls.achivments[0], status=AchivmentStatus.UNLOCKED
+        )
+        cls.order = Order.objects.create(game_id=cls.games[0], user_id=cls.users[0], price=1)
+        cls.staff = User.objects.create(username="staff", is_staff=True)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.staff)
+
+    def test_view_query_budgets(self):
+        for url, budget in [
+            (reverse("games_page"), 0),
+            (reverse("game_list"), 1),
+            (reverse("game_detail", args=[self.games[0].pk]), 3),
+            (reverse("game_search") + "?q=игра", 2),
+            (reverse("achivment_list"), 1),
+            (reverse("user_achivment_list"), 3),
+            (reverse("order_list"), 3),
+            (reverse("game_create"), 2),
+            (reverse("game_update", args=[self.games[0].pk]), 3),
+            (reverse("achivment_create"), 2),
+            (reverse("achivment_update", args=[self.achivments[0].pk]), 4),
+            (reverse("user_achivment_create"), 2),
+            (reverse("user_achivment_update", args=[self.user_achivment.pk]), 5),
+            (reverse("order_create"), 2),
+            (reverse("order_update", args=[self.order.pk]), 5),
+            (reverse("autocomplete_games") + "?q=Игра", 3),
+            (reverse("autocomplete_achivments"), 3),
+            (reverse("autocomplete_users"), 3),
+            (reverse("cache_statistics"), 2),
+        ]:
+            with self.subTest(url=url):
+                self.assertQueryBudget(url, budget)
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse("game_list"))
+        self.assertRegex(response["Server-Timing"], r'^db;dur=[\d.]+;desc="1 queries", db-slowest;dur=[\d.]+$')
+
+    async def test_async_views_are_recorded_without_sync_adapters(self):
+        with override_settings(DEBUG=True), self.assertNoLogs("django.request", "DEBUG"):
+            ASGIHandler()
+        response = await self.async_client.get(reverse("api_games"))
+        self.assertEqual(response.sql_recorder.count, 1)
+        self.assertIn('desc="1 queries"', response["Server-Timing"])
+
+    def test_repeated_queries_are_flagged(self):
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            for game in Game.objects.order_by("pk")[:3]:
+                list(game.achivments.all())
+        self.assertEqual(recorder.count, 4)
+        self.assertEqual(recorder.most_repeated[1], 3)
+        self.assertIn("WHERE \"steam_achivments\".\"game_name_id\" = ?", recorder.most_repeated[0])
+
+        with override_settings(SQL_INSTRUMENTATION_REPEAT_LIMIT=0, SQL_INSTRUMENTATION_LOG=True):
+            with self.assertLogs("steam.sql", "INFO") as logs:
+                response = self.client.get(reverse("game_list"))
+        self.assertEqual(response["X-SQL-Repeated-Query"], "1")
+        self.assertIn("N+1", logs.output[0])
+        self.assertIn("1 запросов", logs.output[1])
+
+    def test_normalize_sql(self):
+        self.assertEqual(
+            normalize_sql("SELECT * FROM t WHERE a = 'x' AND b IN (%s, %s,  %s) LIMIT 21"),
+            "SELECT * FROM t WHERE a = ? AND b IN (...) LIMIT ?",
+        )
+
+
+class AchivmentEventsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.games, cls.achivments, cls.users = create_catalog(users=2)
+        cls.server = User.objects.create(username="server", is_staff=True)
+
+    def setUp(self):
+        self.buffer = ingest.AchivmentEventBuffer(flush_size=5, flush_interval=None)
+        self.addCleanup(self.buffer.close)
+        self.addCleanup(setattr, ingest, "_buffer", ingest._buffer)
+        ingest._buffer = self.buffer
+        self.client.force_login(self.server)
+
+    def post(self, events):
+        return self.client.post(reverse("achivment_events"), {"events": events}, content_type="application/json")
+
+    def event(self, user, achivment, status):
+        return {"user": user.pk, "achivment": achivment.pk, "status": status}
+
+    def test_events_are_buffered_and_flushed_in_bulk(self):
+        response = self.post([
+            self.event(self.users[0], self.achivments[0], "new"),
+            self.event(self.users[0], self.achivments[0], "done"),
+            self.event(self.users[1], self.achivments[1], "new"),
+        ])
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json(), {"accepted": 3})
+        self.assertEqual(len(self.buffer), 2)
+        self.assertFalse(UserAchivment.objects.exists())
+
+        with self.assertNumQueries(9):
+            self.assertEqual(self.buffer.flush(), 2)
+        self.assertEqual(
+            sorted(UserAchivment.objects.values_list("user_id", "achivment_id", "status")),
+            [
+                (self.users[0].pk, self.achivments[0].pk, AchivmentStatus.UNLOCKED),
+                (self.users[1].pk, self.achivments[1].pk, AchivmentStatus.LOCKED),
+            ],
+        )
+
+        self.post([self.event(self.users[0], self.achivments[0], "locked")])
+        self.buffer.close()
+        self.assertEqual(UserAchivment.objects.get(user_id=self.users[0]).status, AchivmentStatus.LOCKED)
+        self.assertEqual(self.buffer.flushed, 3)
+
+    def test_full_buffer_does_not_write_in_request(self):
+        attempted = threading.Event()
+
+        def locked(pending):
+            attempted.set()
+            raise OperationalError("database is locked")
+
+        events = [self.event(user, achivment, "done") for user in self.users for achivment in self.achivments]
+        with self.assertLogs("steam.ingest", "ERROR") as logs:
+            with mock.patch.object(ingest, "write_events", locked):
+                self.assertEqual(self.post(events).status_code, 202)
+                self.assertTrue(attempted.wait(5))
+            self.buffer.close()
+        self.assertIn("Не удалось записать", logs.output[0])
+        self.assertEqual(UserAchivment.objects.count(), len(self.users) * len(self.achivments))
+
+    def test_invalid_events_are_rejected(self):
+        self.assertEqual(self.post([{"user": self.users[0].pk, "status": "done"}]).status_code, 400)
+        self.assertEqual(self.post([self.event(self.users[0], self.achivments[0], "toolong")]).status_code, 400)
+        response = self.post([{"user": self.users[0].pk, "achivment": 0, "status": "done"}])
+        self.assertEqual(response.json()["achivments"], [0])
+        self.assertEqual(self.client.get(reverse("achivment_events")).status_code, 405)
+
+        self.client.force_login(self.users[0])
+        self.assertEqual(self.post([self.event(self.users[0], self.achivments[0], "done")]).status_code, 202)
+        self.assertEqual(self.post([self.event(self.users[1], self.achivments[0], "done")]).status_code, 403)
+        self.assertEqual(len(self.buffer), 1)
+
+    def test_game_servers_authenticate_with_token(self):
+        self.client.logout()
+        event = self.event(self.users[0], self.achivments[0], "done")
+        self.assertEqual(self.post([event]).status_code, 401)
+        with override_settings(ACHIVMENT_INGEST_TOKENS={"secret": "server"}):
+            client = Client(enforce_csrf_checks=True)
+            response = client.post(
+                reverse("achivment_events"), {"events": [event]}, content_type="application/json",
+                headers={"Authorization": "Bearer secret"},
+            )
+            self.assertEqual(response.status_code, 202)
+            response = client.post(
+                reverse("achivment_events"), {"events": [event]}, content_type="application/json",
+                headers={"Authorization": "Bearer wrong"},
+            )
+            self.assertEqual(response.status_code, 401)
+
+        client.force_login(self.server)
+        response = client.post(reverse("achivment_events"), {"events": [event]}, content_type="application/json")
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(len(self.buffer), 1)
+
+    def test_full_buffer_rejects_new_events(self):
+        self.buffer.close()
+        ingest._buffer = self.buffer = ingest.AchivmentEventBuffer(flush_size=2, flush_interval=None, max_pending=2)
+        self.buffer.close()
+        events = [self.event(self.users[0], achivment, "done") for achivment in self.achivments[:3]]
+        self.assertEqual(self.post(events[:2]).status_code, 202)
+        with self.assertLogs("steam.ingest", "ERROR") as logs:
+            response = self.post(events[2:])
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "5")
+        self.assertIn("отклонено 1 событий", logs.output[0])
+        self.assertEqual(self.post(events[:1]).status_code, 202)
+
+        with mock.patch.object(ingest, "write_events", side_effect=OperationalError("database is locked")):
+            with self.assertRaises(OperationalError):
+                self.buffer.flush()
+        with self.assertRaises(ingest.BufferFull):
+            self.buffer.add([(self.users[1].pk, self.achivments[0].pk, AchivmentStatus.UNLOCKED)])
+        self.assertEqual(self.buffer.flush(), 2)
+        self.assertEqual(self.post(events[2:]).status_code, 202)
+
+    def test_parse_status(self):
+        self.assertEqual(ingest.parse_status("Unlocked"), AchivmentStatus.UNLOCKED)
+        self.assertEqual(ingest.parse_status("done"), AchivmentStatus.UNLOCKED)
+        self.assertEqual(ingest.parse_status("1"), AchivmentStatus.IN_PROGRESS)
+        self.assertEqual(ingest.parse_status(0), AchivmentStatus.LOCKED)
+        for value in ("toolong", 3, True, None):
+            with self.assertRaises(ValueError):
+                ingest.parse_status(value)
+
+
+class AchivmentEventsFlushTests(TransactionTestCase):
+    def wait_for_flush(self, buffer, count):
+        for _ in range(500):
+            if buffer.flushed >= count:
+                break
+            time.sleep(0.01)
+        self.assertEqual(buffer.flushed, count)
+
+    def test_deleted_references_are_dropped_on_flush(self):
+        _, achivments, users = create_catalog(users=2)
+        buffer = ingest.AchivmentEventBuffer(flush_interval=None)
+        self.addCleanup(buffer.close)
+        buffer.add([
+            (users[0].pk, achivments[0].pk, AchivmentStatus.UNLOCKED),
+            (users[1].pk, achivments[1].pk, AchivmentStatus.UNLOCKED),
+        ])
+        users[1].delete()
+
+        with self.assertLogs("steam.ingest", "WARNING"):
+            self.assertEqual(buffer.flush(), 1)
+        self.assertEqual(UserAchivment.objects.get().user_id, users[0])
+
+    def test_background_thread_flushes_periodically(self):
+        _, achivments, users = create_catalog(users=1)
+        buffer = ingest.AchivmentEventBuffer(flush_interval=0.01)
+        self.addCleanup(buffer.close)
+        buffer.add([(users[0].pk, achivments[0].pk, AchivmentStatus.UNLOCKED)])
+        self.wait_for_flush(buffer, 1)
+        self.assertTrue(UserAchivment.objects.exists())
+
+    def test_full_buffer_wakes_background_thread(self):
+        _, achivments, users = create_catalog(users=2)
+        buffer = ingest.AchivmentEventBuffer(flush_size=2, flush_interval=None)
+        self.addCleanup(buffer.close)
+        threads = []
+        write_events = ingest.write_events
+
+        def record_thread(pending):
+            threads.append(threading.current_thread().name)
+            write_events(pending)
+
+        with mock.patch.object(ingest, "write_events", record_thread):
+            buffer.add([(users[0].pk, achivments[0].pk, AchivmentStatus.UNLOCKED)])
+            buffer.add([(users[1].pk, achivments[0].pk, AchivmentStatus.UNLOCKED)])
+            self.wait_for_flush(buffer, 2)
+        self.assertEqual(threads, ["achivment-event-flusher"])
+        self.assertEqual(UserAchivment.objects.count(), 2)
+
+
+class LeaderboardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.games, cls.achivments, cls.users = create_catalog(games=2, achivments_per_game=3, users=3)
+
+    def scores(self):
+        rows = LeaderboardEntry.objects.values_list("user_id", "game_id", "unlocked")
+        return sorted(rows, key=lambda row: (row[0], row[1] or 0))
+
+    def assertMatchesRebuild(self):
+        incremental = self.scores()
+        rebuild_leaderboard(batch_size=2)
+        self.assertEqual(incremental, self.scores())
+        return incremental
+
+    def test_signals_apply_deltas(self):
+        first, second = self.users[:2]
+        game = self.games[0].pk
+        created = [
+            UserAchivment.objects.create(user_id=first, achivment_id=achivment, status=AchivmentStatus.UNLOCKED)
+            for achivment in self.achivments[:4]
+        ]
+        UserAchivment.objects.create(user_id=second, achivment_id=self.achivments[0], status=AchivmentStatus.LOCKED)
+        self.assertEqual(self.assertMatchesRebuild(), [
+            (first.pk, None, 4), (first.pk, game, 3), (first.pk, self.games[1].pk, 1),
+        ])
+
+        with self.assertNumQueries(8):
+            created[0].status = AchivmentStatus.LOCKED
+            created[0].save()
+        with self.assertNumQueries(1):
+            created[1].save()
+        created[2].delete()
+        self.assertEqual(self.assertMatchesRebuild(), [(first.pk, None, 2), (first.pk, game, 1), (first.pk, self.games[1].pk, 1)])
+
+    def test_deferred_instances_keep_leaderboard_consistent(self):
+        created = [
+            UserAchivment.objects.create(user_id=self.users[0], achivment_id=achivment, status=AchivmentStatus.UNLOCKED)
+            for achivment in self.achivments[:3]
+        ]
+        self.assertEqual(len(UserAchivment.objects.only("id")), 3)
+        self.assertEqual(len(Achivments.objects.only("id")), len(self.achivments))
+
+        deferred = UserAchivment.objects.only("id").get(pk=created[0].pk)
+        deferred.status = AchivmentStatus.LOCKED
+        deferred.save()
+        UserAchivment.objects.only("id").get(pk=created[1].pk).delete()
+        achivment = Achivments.objects.only("id").get(pk=self.achivments[2].pk)
+        achivment.game_name = self.games[1]
+        achivment.save()
+        self.assertEqual(self.assertMatchesRebuild(), [(self.users[0].pk, None, 1), (self.users[0].pk, self.games[1].pk, 1)])
+
+    def test_drifted_entries_are_clamped_instead_of_failing(self):
+        user_achivment = UserAchivment.objects.create(
+            user_id=self.users[0], achivment_id=self.achivments[0], status=AchivmentStatus.UNLOCKED
+        )
+        LeaderboardEntry.objects.filter(game__isnull=False).update(unlocked=0)
+        user_achivment.status = AchivmentStatus.LOCKED
+        user_achivment.save()
+        self.assertEqual(self.scores(), [])
+
+    def test_ingest_and_achivment_moves_keep_leaderboard_consistent(self):
+        buffer = ingest.AchivmentEventBuffer(flush_interval=None)
+        self.addCleanup(buffer.close)
+        buffer.add([
+            (user.pk, achivment.pk, AchivmentStatus.UNLOCKED) for user in self.users for achivment in self.achivments[:2]
+        ])
+        buffer.add([(self.users[0].pk, self.achivments[0].pk, AchivmentStatus.LOCKED)])
+        buffer.flush()
+        self.assertEqual(dict((row[0], row[2]) for row in self.scores() if row[1] is None), {
+            self.users[0].pk: 1, self.users[1].pk: 2, self.users[2].pk: 2,
+        })
+
+        achivment = Achivments.objects.get(pk=self.achivments[1].pk)
+        achivment.game_name = self.games[1]
+        achivment.save()
+        self.assertMatchesRebuild()
+        self.users[1].delete()
+        self.assertMatchesRebuild()
+
+    def test_top_players_view(self):
+        for count, user in zip([1, 3, 2], self.users):
+            for achivment in self.achivments[:count]:
+                UserAchivment.objects.create(user_id=user, achivment_id=achivment, status=AchivmentStatus.UNLOCKED)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("leaderboard"))
+        self.assertEqual([entry.user for entry in response.context["entries"]], [self.users[1], self.users[2], self.users[0]])
+
+        response = self.client.get(reverse("game_leaderboard", args=[self.games[0].pk]))
+        self.assertEqual([entry.unlocked for entry in response.context["entries"]], [3, 2, 1])
+        self.assertEqual(self.client.get(reverse("game_leaderboard", args=[0])).status_code, 404)
+
+        plan = top_players(self.games[0].pk).explain()
+        self.assertIn("steam_leaderboard_top_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_achivment_completion(self):
+        for user in self.users:
+            Order.objects.create(game_id=self.games[0], user_id=user, price=100)
+        for user, status in zip(self.users, AchivmentStatus):
+            UserAchivment.objects.create(user_id=user, achivment_id=self.achivments[0], status=status)
+        UserAchivment.objects.create(user_id=self.users[2], achivment_id=self.achivments[1], status=AchivmentStatus.UNLOCKED)
+
+        players, achivments = achivment_completion(self.games[0].pk)
+        self.assertEqual(players, 3)
+        self.assertEqual([(achivment.unlocked, round(achivment.completion)) for achivment in achivments], [
+            (1, 33), (1, 33), (0, 0),
+        ])
+        response = self.client.get(reverse("game_leaderboard", args=[self.games[0].pk]))
+        self.assertContains(response, "33.3%")
+        self.assertContains(response, "<td>67%</td>", html=True)
+
+        unlocked = UserAchivment.objects.filter(status=AchivmentStatus.UNLOCKED).order_by()
+        self.assertIn("steam_ua_achiv_unlocked_idx", unlocked.filter(achivment_id=self.achivments[0]).explain())
+        self.assertIn("steam_ua_user_unlocked_idx", unlocked.values("user_id").annotate(count=Count("pk")).explain())
+        with self.assertRaises(IntegrityError):
+            UserAchivment.objects.filter(pk=UserAchivment.objects.first().pk).update(status=3)
+
+    def test_completion_is_cached_until_it_changes(self):
+        cache.clear()
+        Order.objects.create(game_id=self.games[0], user_id=self.users[0], price=100)
+        url = reverse("game_leaderboard", args=[self.games[0].pk])
+        self.client.get(url)
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual([achivment.unlocked for achivment in response.context["achivments"]], [0, 0, 0])
+
+        ua = UserAchivment.objects.create(user_id=self.users[0], achivment_id=self.achivments[1], status=AchivmentStatus.UNLOCKED)
+        response = self.client.get(url)
+        self.assertEqual([achivment.completion for achivment in response.context["achivments"]], [0, 100, 0])
+        Order.objects.create(game_id=self.games[0], user_id=self.users[1], price=100)
+        self.assertEqual(self.client.get(url).context["players"], 2)
+        ua.delete()
+        self.assertEqual([achivment.unlocked for achivment in self.client.get(url).context["achivments"]], [0, 0, 0])
+
+    def test_rebuild_command(self):
+        UserAchivment.objects.create(user_id=self.users[0], achivment_id=self.achivments[0], status=AchivmentStatus.UNLOCKED)
+        LeaderboardEntry.objects.all().delete()
+        out = io.StringIO()
+        call_command("rebuild_leaderboard", stdout=out)
+        self.assertIn("2 строк", out.getvalue())
+        self.assertEqual(len(self.scores()), 2)
+
+
+class RevenueRollupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.games, cls.achivments, cls.users = create_catalog(games=2, users=2)
+        cls.staff = User.objects.create(username="finance", is_staff=True)
+
+    def order(self, game, price, day, user=None):
+        return Order.objects.create(
+            game_id=game, user_id=user or self.users[0], price=price,
+            created_at=datetime(2026, 1, day, 12, tzinfo=dt_timezone.utc),
+        )
+
+    def rollups(self):
+        return sorted(RevenueRollup.objects.values_list("game_id", "day", "orders", "revenue"))
+
+    def assertMatchesRebuild(self):
+        incremental = self.rollups()
+        rebuild_revenue(batch_size=2)
+        self.assertEqual(incremental, self.rollups())
+        return incremental
+
+    def test_order_changes_update_rollup(self):
+        first, second = self.games
+        orders = [self.order(first, 100, 1), self.order(first, 50, 1), self.order(second, 70, 2)]
+        self.assertEqual(self.assertMatchesRebuild(), [
+            (first.pk, date(2026, 1, 1), 2, 150), (second.pk, date(2026, 1, 2), 1, 70),
+        ])
+
+        orders[0].price = 10
+        orders[0].save()
+        orders[1].game_id = second
+        orders[1].created_at = datetime(2026, 1, 2, tzinfo=dt_timezone.utc)
+        orders[1].save()
+        orders[2].delete()
+        self.assertEqual(self.assertMatchesRebuild(), [
+            (first.pk, date(2026, 1, 1), 1, 10), (second.pk, date(2026, 1, 2), 1, 50),
+        ])
+
+        self.users[0].delete()
+        self.assertEqual(self.assertMatchesRebuild(), [])
+
+    def test_deferred_and_naive_orders_keep_rollup_consistent(self):
+        orders = [self.order(self.games[0], 100, 1), self.order(self.games[0], 50, 2)]
+        self.assertEqual(len(Order.objects.only("id")), 2)
+        self.assertEqual(len(Order.objects.defer("created_at")), 2)
+
+        deferred = Order.objects.only("id").get(pk=orders[0].pk)
+        deferred.game_id = self.games[1]
+        deferred.save()
+        Order.objects.defer("created_at").get(pk=orders[1].pk).delete()
+        with self.assertWarns(RuntimeWarning):
+            Order.objects.create(game_id=self.games[0], user_id=self.users[0], price=5, created_at=datetime(2026, 1, 3))
+        self.assertEqual(self.assertMatchesRebuild(), [
+            (self.games[0].pk, date(2026, 1, 3), 1, 5), (self.games[1].pk, date(2026, 1, 1), 1, 100),
+        ])
+
+    def test_failed_save_does_not_change_rollup(self):
+        order = self.order(self.games[0], 100, 1)
+        order.price = -1
+        with self.assertRaises(IntegrityError):
+            order.save()
+        self.assertEqual(self.rollups(), [(self.games[0].pk, date(2026, 1, 1), 1, 100)])
+
+    def test_report_reads_only_the_rollup(self):
+        for day in range(1, 11):
+            self.order(self.games[0], 100, day)
+            self.order(self.games[1], 10, day)
+        self.client.force_login(self.staff)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("revenue_report"), {"start": "2026-01-02", "end": "2026-01-05"})
+        self.assertEqual(
+            [(row["game_id"], row["orders_count"], row["revenue_total"]) for row in response.context["rows"]],
+            [(self.games[0].pk, 4, 400), (self.games[1].pk, 4, 40)],
+        )
+        self.assertFalse(any("steam_order" in query["sql"] for query in context.captured_queries))
+
+        response = self.client.get(reverse("game_revenue_report", args=[self.games[1].pk]), {"start": "2026-01-09"})
+        self.assertEqual([row["day"] for row in response.context["rows"]], [date(2026, 1, 10), date(2026, 1, 9)])
+        self.assertEqual(self.client.get(reverse("revenue_report"), {"start": "2026-02-30"}).status_code, 404)
+
+        self.client.force_login(self.users[0])
+        self.assertEqual(self.client.get(reverse("revenue_report")).status_code, 302)
+
+    def test_benchmark_command_rolls_back(self):
+        out = io.StringIO()
+        call_command("benchmark_revenue", max_orders=2000, games=5, days=3, repeats=1, batch_size=500, stdout=out)
+        self.assertIn("2000", out.getvalue())
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(RevenueRollup.objects.exists())
+
+
+class RecommendationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.games, cls.achivments, cls.users = create_catalog(games=6, users=8)
+        cls.generator = random.Random(5)
+
+    def buy(self, count):
+        Order.objects.bulk_create(
+            Order(game_id=self.generator.choice(self.games), user_id=self.generator.choice(self.users), price=1)
+            for _ in range(count)
+        )
+
+    def expected(self, per_game):
+        owned = {}
+        for user_id, game_id in Order.objects.values_list("user_id", "game_id"):
+            owned.setdefault(user_id, set()).add(game_id)
+        buyers = {}
+        for games in owned.values():
+            for game in games:
+                for other in games - {game}:
+                    buyers[game, other] = buyers.get((game, other), 0) + 1
+        result = []
+        for game in sorted({game for game, _ in buyers}):
+            ranked = sorted((other for g, other in buyers if g == game), key=lambda other: (-buyers[game, other], other))
+            result.extend((game, other, buyers[game, other]) for other in ranked[:per_game])
+        return result
+
+    def stored(self):
+        return list(GameRecommendation.objects.order_by("game_id", "-buyers", "recommended_id").values_list(
+            "game_id", "recommended_id", "buyers"
+        ))
+
+    def test_full_build_keeps_top_k(self):
+        self.buy(40)
+        update_recommendations(full=True, per_game=2, max_pending_pairs=3, chunk_size=7)
+        self.assertEqual(self.stored(), self.expected(2))
+
+    def test_incremental_updates_match_full_build(self):
+        self.buy(20)
+        call_command("build_recommendations", top_k=3, stdout=io.StringIO())
+        for _ in range(3):
+            self.buy(10)
+            out = io.StringIO()
+            call_command("build_recommendations", top_k=3, max_pairs=5, stdout=out)
+            self.assertEqual(self.stored(), self.expected(3))
+
+        with self.assertNumQueries(4):
+            counter = update_recommendations(per_game=3)
+        self.assertEqual(counter.users, 0)
+        self.assertIn("Рекомендации обновлены", out.getvalue())
+
+    def test_game_page_shows_recommendations(self):
+        first, second = self.games[:2]
+        Order.objects.bulk_create(
+            Order(game_id=game, user_id=user, price=1) for user in self.users[:2] for game in (first, second)
+        )
+        call_command("build_recommendations", stdout=io.StringIO())
+        response = self.client.get(reverse("game_detail", args=[first.pk]))
+        self.assertContains(response, "С этой игрой покупают")
+        self.assertContains(response, reverse("game_detail", args=[second.pk]))
+
+
+class AchivmentStatusMigrationTests(TransactionTestCase):
+    def migrate(self, target):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate([("steam", target)])
+        return executor.loader.project_state([("steam", target)]).apps
+
+    def test_legacy_statuses_are_converted_like_the_importer_parses_them(self):
+        self.addCleanup(self.migrate, "0008_achivment_status")
+        apps = self.migrate("0007_recommendations")
+        Game = apps.get_model("steam", "Game")
+        Achivments = apps.get_model("steam", "Achivments")
+        UserAchivment = apps.get_model("steam", "UserAchivment")
+        LeaderboardEntry = apps.get_model("steam", "LeaderboardEntry")
+        user = apps.get_model("auth", "User").objects.create(username="legacy")
+        game = Game.objects.create(name="Игра", price=1, description="")
+        statuses = ["done", "True", "true", " DONE", "In_Progress", "new", "no"]
+        for status in statuses:
+            achivment = Achivments.objects.create(game_name=game, name_achivments=status, description="")
+            UserAchivment.objects.create(user_id=user, achivment_id=achivment, status=status)
+        LeaderboardEntry.objects.bulk_create([
+            LeaderboardEntry(user=user, game=game, unlocked=2), LeaderboardEntry(user=user, game=None, unlocked=2),
+        ])
+
+        self.migrate("0008_achivment_status")
+        self.assertEqual(
+            dict(UserAchivment.objects.values_list("achivment_id__name_achivments", "status")),
+            {"done": 2, "True": 2, "true": 2, " DONE": 2, "In_Progress": 1, "new": 0, "no": 0},
+        )
+        entries = LeaderboardEntry.objects.order_by("game_id").values_list("game_id", "unlocked")
+        migrated = list(entries)
+        self.assertEqual(migrated, [(None, 4), (game.pk, 4)])
+        rebuild_leaderboard()
+        self.assertEqual(migrated, list(entries))
@@ -1,22 +1,53 @@
 from django.urls import path
-from . import views
+from . import api, views
 
 urlpatterns = [
     path('', views.games_page, name='games_page'),
     
     # Game URLs
+    path('games/', views.game_list, name='game_list'),
+    path('games/<int:pk>/', views.game_detail, name='game_detail'),
+    path('games/search/', views.game_search, name='game_search'),
+    path('games/<int:game_pk>/leaderboard/', views.leaderboard, name='game_leaderboard'),
+    path('leaderboard/', views.leaderboard, name='leaderboard'),
     path('games/create/', views.game_create, name='game_create'),
     path('games/update/<int:pk>/', views.game_update, name='game_update'),
     
     # Achivments URLs
+    path('achivments/', views.achivment_list, name='achivment_list'),
     path('achivments/create/', views.achivment_create, name='achivment_create'),
     path('achivments/update/<int:pk>/', views.achivment_update, name='achivment_update'),
     
     # UserAchivment URLs
+    path('user-achivments/', views.user_achivment_list, name='user_achivment_list'),
     path('user-achivments/create/', views.user_achivment_create, name='user_achivment_create'),
     path('user-achivments/update/<int:pk>/', views.user_achivment_update, name='user_achivment_update'),
     
     # Order URLs
+    path('orders/', views.order_list, name='order_list'),
     path('orders/create/', views.order_create, name='order_create'),
     path('orders/update/<int:pk>/', views.order_update, name='order_update'),
+    
+    # Autocomplete URLs
+    path('autocomplete/games/', views.autocomplete_games, name='autocomplete_games'),
+    path('autocomplete/achivments/', views.autocomplete_achivments, name='autocomplete_achivments'),
+    path('autocomplete/users/', views.autocomplete_users, name='autocomplete_users'),
+    
+    # JSON API URLs
+    path('api/games/', api.games, name='api_games'),
+    path('api/games/<int:pk>/', api.game, name='api_game'),
+    path('api/achivments/', api.achivments, name='api_achivments'),
+    path('api/users/<int:user_pk>/achivments/', api.user_achivments, name='api_user_achivments'),
+    path('api/users/<int:user_pk>/orders/', api.user_orders, name='api_user_orders'),
+    path('api/achivment-events/', views.achivment_events, name='achivment_events'),
+    
+    # Export URLs
+    path('export/<slug:table>.<slug:format>', views.export, name='export'),
+    
+    # Report URLs
+    path('reports/revenue/', views.revenue_report, name='revenue_report'),
+    path('reports/revenue/<int:game_pk>/', views.revenue_report, name='game_revenue_report'),
+    
+    # Monitoring URLs
+    path('cache/stats/', views.cache_statistics, name='cache_statistics'),
 ]
\ No newline at end of file
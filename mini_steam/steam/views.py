@@ -1,11 +1,136 @@
+import hmac
+import json
+
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
+from django.utils.dateparse import parse_date
 from django.contrib.auth.decorators import login_required
-from .models import Game, Achivments, UserAchivment, Order
+from django.contrib.auth.models import User
+from django.contrib.admin.views.decorators import staff_member_required
+from django.db.models import Count, Prefetch
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.middleware.csrf import CsrfViewMiddleware
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from .models import Game, Achivments, UserAchivment, Order, GameRecommendation
 from .forms import GameForm, AchivmentsForm, UserAchivmentForm, OrderForm
+from .cache import CATALOG_VERSION_KEY, cache_stats, cached_page, game_version_key
+from .export import export_table
+from .ingest import BufferFull, get_buffer, missing_references, parse_events
+from .leaderboard import cached_achivment_completion, top_players
+from .revenue import revenue_by_day, revenue_by_game
+from .pagination import keyset_paginate
+from .search import prefix_filter, search_games
 
 def games_page(request):
     return render(request, "index.html")
 
+@cached_page("game_list", lambda: [CATALOG_VERSION_KEY], params=("after", "before"))
+def game_list(request):
+    page = keyset_paginate(request, Game.objects.all())
+    return render(request, "game_list.html", {
+        "page": page,
+        "title": "Каталог игр"
+    })
+
+@cached_page("game_detail", lambda pk: [game_version_key(pk)])
+def game_detail(request, pk):
+    queryset = Game.objects.annotate(orders_count=Count("orders")).prefetch_related(
+        Prefetch("achivments", queryset=Achivments.objects.order_by("pk")),
+        Prefetch("recommendations", queryset=GameRecommendation.objects.select_related("recommended").order_by(
+            "-buyers", "recommended"
+        )),
+    )
+    game = get_object_or_404(queryset, pk=pk)
+    return render(request, "game_detail.html", {
+        "game": game,
+        "title": game.name
+    })
+
+def leaderboard(request, game_pk=None):
+    game = get_object_or_404(Game.objects.only("name"), pk=game_pk) if game_pk is not None else None
+    players, achivments = cached_achivment_completion(game_pk) if game else (0, [])
+    return render(request, "leaderboard.html", {
+        "entries": top_players(game_pk),
+        "game": game,
+        "players": players,
+        "achivments": achivments,
+        "title": f"Лидеры: {game.name}" if game else "Лидеры"
+    })
+
+def report_date(value):
+    if not value:
+        return None
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is None:
+        raise Http404("Некорректная дата")
+    return day
+
+@staff_member_required
+def revenue_report(request, game_pk=None):
+    start = report_date(request.GET.get("start"))
+    end = report_date(request.GET.get("end"))
+    if game_pk is None:
+        game = None
+        rows = revenue_by_game(start, end)
+    else:
+        game = get_object_or_404(Game.objects.only("name"), pk=game_pk)
+        rows = revenue_by_day(game_pk, start, end)
+    return render(request, "revenue_report.html", {
+        "rows": rows,
+        "game": game,
+        "start": start,
+        "end": end,
+        "title": f"Выручка: {game.name}" if game else "Выручка по играм"
+    })
+
+def game_search(request):
+    return render(request, "game_search.html", {
+        "page": search_games(request),
+        "title": "Поиск игр"
+    })
+
+@staff_member_required
+def cache_statistics(request):
+    return JsonResponse(cache_stats())
+
+@staff_member_required
+def export(request, table, format):
+    try:
+        content, content_type = export_table(table, format)
+    except ValueError as error:
+        raise Http404(str(error))
+    response = StreamingHttpResponse(content, content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{table}.{format}"'
+    return response
+
+def achivment_list(request):
+    page = keyset_paginate(request, Achivments.objects.select_related("game_name"))
+    return render(request, "achivment_list.html", {
+        "page": page,
+        "title": "Достижения"
+    })
+
+@login_required
+def user_achivment_list(request):
+    queryset = UserAchivment.objects.select_related("user_id", "achivment_id__game_name")
+    page = keyset_paginate(request, queryset)
+    return render(request, "user_achivment_list.html", {
+        "page": page,
+        "title": "Достижения пользователей"
+    })
+
+@login_required
+def order_list(request):
+    page = keyset_paginate(request, Order.objects.select_related("game_id", "user_id"))
+    return render(request, "order_list.html", {
+        "page": page,
+        "title": "Заказы"
+    })
+
 @login_required
 def game_create(request):
     if request.method == "POST":
@@ -136,4 +261,76 @@ def order_update(request, pk):
         "form": form,
         "order": order,
         "title": "Редактировать заказ"
-    })
\ No newline at end of file
+    })
+
+def token_user(token):
+    for known, username in getattr(settings, "ACHIVMENT_INGEST_TOKENS", {}).items():
+        if hmac.compare_digest(token.encode(), known.encode()):
+            return User.objects.filter(username=username, is_active=True).first()
+    return None
+
+def ingest_user(request):
+    authorization = request.headers.get("Authorization", "")
+    if authorization.startswith("Bearer "):
+        user = token_user(authorization.removeprefix("Bearer ").strip())
+        if user is None:
+            return None, JsonResponse({"detail": "Недействительный токен"}, status=401)
+        return user, None
+
+    if not request.user.is_authenticated:
+        return None, JsonResponse({"detail": "Требуется авторизация"}, status=401)
+    if CsrfViewMiddleware(lambda request: None).process_view(request, None, (), {}) is not None:
+        return None, JsonResponse({"detail": "Ошибка проверки CSRF"}, status=403)
+    return request.user, None
+
+@csrf_exempt
+@require_POST
+def achivment_events(request):
+    user, error = ingest_user(request)
+    if error is not None:
+        return error
+    try:
+        events = parse_events(json.loads(request.body))
+    except json.JSONDecodeError:
+        return JsonResponse({"detail": "Некорректный JSON"}, status=400)
+    except ValueError as error:
+        return JsonResponse({"detail": str(error)}, status=400)
+
+    if not user.is_staff and any(event_user != user.pk for event_user, _, _ in events):
+        return JsonResponse({"detail": "Недостаточно прав"}, status=403)
+    users, achivments = missing_references([(event_user, achivment) for event_user, achivment, _ in events])
+    if users or achivments:
+        return JsonResponse({
+            "detail": "Неизвестные пользователи или достижения",
+            "users": sorted(users),
+            "achivments": sorted(achivments),
+        }, status=400)
+
+    try:
+        get_buffer().add(events)
+    except BufferFull as error:
+        response = JsonResponse({"detail": str(error)}, status=503)
+        response["Retry-After"] = "5"
+        return response
+    return JsonResponse({"accepted": len(events)}, status=202)
+
+AUTOCOMPLETE_LIMIT = 20
+
+def autocomplete(request, queryset, field):
+    prefix = request.GET.get("q", "")
+    if prefix:
+        queryset = prefix_filter(queryset, field, prefix)
+    rows = queryset.order_by(field, "pk").values_list("pk", field)[:AUTOCOMPLETE_LIMIT]
+    return JsonResponse({"results": [{"id": pk, "text": text} for pk, text in rows]})
+
+@login_required
+def autocomplete_games(request):
+    return autocomplete(request, Game.objects.all(), "name")
+
+@login_required
+def autocomplete_achivments(request):
+    return autocomplete(request, Achivments.objects.all(), "name_achivments")
+
+@login_required
+def autocomplete_users(request):
+    return autocomplete(request, User.objects.all(), "username")
\ No newline at end of file
@@ -0,0 +1,27 @@
+from django import forms
+from django.urls import reverse
+
+
+class AutocompleteSelect(forms.Select):
+    class Media:
+        js = ["steam/autocomplete.js"]
+
+    def __init__(self, url_name, attrs=None):
+        super().__init__(attrs)
+        self.url_name = url_name
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context["widget"]["attrs"]["data-autocomplete-url"] = reverse(self.url_name)
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        selected_choices = {str(v) for v in value if str(v) not in self.choices.field.empty_values}
+        options = [self.create_option(name, "", self.choices.field.empty_label or "", not selected_choices, 0)]
+        if selected_choices:
+            queryset = self.choices.queryset.filter(pk__in=selected_choices)
+            for obj in queryset:
+                options.append(self.create_option(
+                    name, obj.pk, self.choices.field.label_from_instance(obj), True, len(options)
+                ))
+        return [(None, options, 0)]